@@ -0,0 +1,27 @@
+import asyncio
+
+from cache import normalize_word
+
+
+class AsyncPons(object):
+    """asyncio front-end of a Pons client.
+
+    Searches run the pooled client on an executor; coroutines searching
+    the same word at the same time await a single task.
+    """
+
+    def __init__(self, pons, executor=None):
+        self.pons = pons
+        self.executor = executor
+        self.in_flight = {}
+
+    async def search(self, word):
+        key = normalize_word(word)
+        task = self.in_flight.get(key)
+        if task is None:
+            loop = asyncio.get_running_loop()
+            task = asyncio.ensure_future(
+                loop.run_in_executor(self.executor, self.pons.search, word))
+            self.in_flight[key] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(key, None))
+        return await asyncio.shield(task)
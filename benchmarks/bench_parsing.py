@@ -0,0 +1,69 @@
+"""Per word parse time of Pons results.
+
+The corpus is every raw Pons response stored in the lookup cache
+(db/cache.db). The raw_result column of the posts table keeps the already
+parsed word details, so it has no html left to parse. When the cache is
+empty the recorded responses of the tests are used.
+
+    python benchmarks/bench_parsing.py [--repeat 200]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import parsing
+from exceptions import DeutscherBotException
+
+CACHE_PATH = os.path.join(ROOT, 'db', 'cache.db')
+FIXTURES_PATH = os.path.join(ROOT, 'tests', 'fixtures', 'pons_responses.json')
+
+
+def load_corpus():
+    corpus = {}
+    if os.path.exists(CACHE_PATH):
+        connection = sqlite3.connect(CACHE_PATH)
+        rows = connection.execute(
+            'SELECT word, result FROM lookups WHERE result IS NOT NULL')
+        corpus = {word: json.loads(result) for word, result in rows}
+        connection.close()
+    if not corpus:
+        with open(FIXTURES_PATH, encoding='utf-8') as f:
+            corpus = json.load(f)
+    return corpus
+
+
+def bench(corpus, repeat):
+    timings = {}
+    for word, response in corpus.items():
+        hit = response['hits'][0]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            try:
+                parsing.parse_hit(hit)
+            except DeutscherBotException:
+                pass
+        timings[word] = (time.perf_counter() - start) / repeat
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    timings = bench(load_corpus(), args.repeat)
+    for word, seconds in sorted(timings.items(), key=lambda item: -item[1]):
+        print(f"{word:<30} {seconds * 1e6:10.1f} µs")
+    if timings:
+        mean = sum(timings.values()) / len(timings)
+        print(f"{len(timings)} words, mean {mean * 1e6:.1f} µs per word")
+
+
+if __name__ == '__main__':
+    main()
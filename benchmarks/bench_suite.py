@@ -0,0 +1,201 @@
+"""Throughput benchmarks of the bot, replaying recorded responses offline.
+
+    python benchmarks/bench_suite.py --output bench_results.json
+    python benchmarks/bench_suite.py --rows 10000 100000 1000000
+
+Measures, for every sample word list of the tests:
+  * end-to-end words/sec of scan_posts over a fake subreddit,
+  * latency per stage of search_word and prepare_comment,
+and ops/sec of visited_db and add_to_db on a posts table of each size
+in --rows. Results are written as json, tagged with the current commit,
+so runs of different commits can be compared. Words without a recorded
+response are answered with synthetic ones; "synthetic_responses" in the
+results counts them, and only runs with the same recordings should be
+compared.
+
+With --record, the Pons api is queried for the sample words (config.py
+must have a PONS_KEY) and the responses saved to --responses.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime as d
+
+BENCHMARKS_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARKS_PATH)
+
+from replay import (ROOT, ReplayPons, fake_post, fake_reddit,
+                    load_responses, record_responses, sample_words)
+from cache import LookupCache
+from context import AppContext
+from exceptions import DeutscherBotException
+from main import DeutscherBot
+from metrics import REGISTRY
+from pipeline import TokenBucket
+
+RESPONSES_PATH = os.path.join(BENCHMARKS_PATH, 'pons_recorded.json')
+DB_SIZES = (10000, 100000, 1000000)
+DB_OPS = 2000
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT,
+                                       text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def stage_latencies(stages):
+    latencies = REGISTRY.to_dict()['latency_seconds']
+    return {stage: {'count': latencies[stage]['count'],
+                    'mean_ms': latencies[stage]['sum'] /
+                    latencies[stage]['count'] * 1000}
+            for stage in stages if stage in latencies}
+
+
+def bench_scan(words, responses, workers):
+    """Reply to a fake subreddit with a post for every word."""
+    REGISTRY.reset()
+    with tempfile.TemporaryDirectory() as db_path:
+        cache = LookupCache(os.path.join(db_path, 'cache.db'))
+        context = AppContext(db_path=db_path, reddit=fake_reddit(words),
+                             cache=cache, pons=ReplayPons(responses, cache=cache))
+        with context:
+            bot = DeutscherBot('Sprache', context=context)
+            bot.reply_limiter = TokenBucket(rate=float('inf'),
+                                            capacity=float('inf'))
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                bot.scan_posts(cant=len(words), workers=workers)
+            elapsed = time.perf_counter() - start
+            replied = context.store.db_connection.execute(
+                'SELECT COUNT(*) FROM posts').fetchone()[0]
+    return {
+        'words': len(words),
+        'replied': replied,
+        'seconds': elapsed,
+        'words_per_sec': len(words) / elapsed,
+        'stages': stage_latencies(('search_word', 'prepare_comment',
+                                   'pons_search', 'add_to_db', 'reply')),
+    }
+
+
+def bench_lookup(words, responses):
+    """search_word + prepare_comment of every word, without cache or db."""
+    REGISTRY.reset()
+    context = AppContext(db_path=None, reddit=fake_reddit(words),
+                         pons=ReplayPons(responses))
+    bot = DeutscherBot('Sprache', context=context)
+    start = time.perf_counter()
+    for word in words:
+        try:
+            bot.prepare_comment(bot.search_word(word))
+        except DeutscherBotException:
+            pass
+    elapsed = time.perf_counter() - start
+    return {
+        'words': len(words),
+        'seconds': elapsed,
+        'words_per_sec': len(words) / elapsed,
+        'stages': stage_latencies(('search_word', 'prepare_comment')),
+    }
+
+
+def bench_db(rows, ops=DB_OPS):
+    """visited_db and add_to_db ops/sec on a posts table of rows posts."""
+    with tempfile.TemporaryDirectory() as db_path:
+        context = AppContext(db_path=db_path, reddit=fake_reddit([]))
+        store = context.store
+        with store.db_connection:
+            store.db_connection.executemany(
+                'INSERT INTO posts(post_id, link, word, date, subreddit) '
+                'VALUES (?, ?, ?, ?, ?)',
+                ((f'old{i:x}', '', 'Dampf', '', 'Sprache')
+                 for i in range(rows)))
+        bot = DeutscherBot('Sprache', context=context)
+        posts = [fake_post(rows + i, 'Dampf') for i in range(ops)]
+        known = [fake_post(0, 'Dampf') for _ in range(ops)]
+        for i, post in enumerate(known):
+            post.id = f'old{(i * 7919) % rows:x}'
+
+        start = time.perf_counter()
+        for old, new in zip(known, posts):
+            bot.visited_db(old)
+            bot.visited_db(new)
+        visited_elapsed = time.perf_counter() - start
+
+        word_details = {'word': 'Dampf', 'translation': 'steam'}
+        start = time.perf_counter()
+        for post in posts:
+            bot.add_to_db(post, word_details)
+        store.flush()
+        add_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        store.new_post_ids(post.id for post in known + posts)
+        batch_elapsed = time.perf_counter() - start
+        context.close()
+
+    return {
+        'rows': rows,
+        'visited_db_ops_per_sec': 2 * ops / visited_elapsed,
+        'add_to_db_ops_per_sec': ops / add_elapsed,
+        'new_post_ids_ids_per_sec': 2 * ops / batch_elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--responses', default=RESPONSES_PATH,
+                        help="Recorded Pons responses to replay")
+    parser.add_argument('--record', action='store_true',
+                        help="Record the responses from the Pons api first")
+    parser.add_argument('--rows', type=int, nargs='*', default=DB_SIZES)
+    parser.add_argument('--workers', type=int, default=DeutscherBot.LOOKUP_WORKERS)
+    args = parser.parse_args(argv)
+
+    samples = sample_words()
+    all_words = set().union(*samples.values())
+    if args.record:
+        with AppContext() as context:
+            record_responses(all_words, args.responses, context.pons)
+    responses, synthetic = load_responses(all_words, args.responses)
+    if synthetic:
+        print(f"Warning: {len(synthetic)} of {len(all_words)} words have no "
+              f"recorded response and use synthetic ones")
+
+    results = {
+        'commit': git_commit(),
+        'date': d.now().isoformat(),
+        'python': platform.python_version(),
+        'recorded_responses': len(all_words) - len(synthetic),
+        'synthetic_responses': len(synthetic),
+        'lookup': {}, 'scan': {}, 'db': [],
+    }
+    for name, words in samples.items():
+        results['lookup'][name] = bench_lookup(words, responses)
+        results['scan'][name] = bench_scan(words, responses, args.workers)
+        print(f"{name}: {results['lookup'][name]['words_per_sec']:.0f} lookups/sec, "
+              f"{results['scan'][name]['words_per_sec']:.0f} scanned words/sec")
+    for rows in args.rows:
+        result = bench_db(rows)
+        results['db'].append(result)
+        print(f"{rows} rows: {result['visited_db_ops_per_sec']:.0f} visited_db/sec, "
+              f"{result['add_to_db_ops_per_sec']:.0f} add_to_db/sec")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Recorded Pons responses and a fake subreddit to replay them offline.
+
+Responses are read from a file recorded with `bench_suite.py --record`.
+Words missing from it get a synthetic response copied from the test
+fixtures: capitalized words are answered like a noun, the rest like a
+verb, and a deterministic share of words as a translation or with no
+results. Synthetic responses cost the same to parse for every word, so
+results using them are not comparable with runs on real recordings.
+"""
+import copy
+import json
+import os
+import sys
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TESTS_PATH = os.path.join(ROOT, 'tests')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, TESTS_PATH)
+
+from conftest import Post, Reddit, Subreddit
+from exceptions import NoResultsError
+from pons import Pons
+
+FIXTURES_PATH = os.path.join(TESTS_PATH, 'fixtures', 'pons_responses.json')
+
+
+def sample_words():
+    """The sample word lists of the tests, by name."""
+    import tests_german_bot as samples
+    return {name: getattr(samples, name) for name in
+            ('sample_100', 'sample_200', 'sample_500', 'sample_800',
+             'sample_1000')}
+
+
+def _derived_response(word, templates):
+    bucket = zlib.crc32(word.encode('utf-8')) % 20
+    if bucket == 0:
+        return None
+    if bucket == 1:
+        return templates['Review']
+    template = templates['Dampf'] if word[:1].isupper() else templates['gehören']
+    response = copy.deepcopy(template)
+    rom = response['hits'][0]['roms'][0]
+    old = rom['headword'].replace('·', '')
+    rom['headword'] = word
+    rom['headword_full'] = rom['headword_full'].replace(
+        rom['headword_full'].split(' ', 1)[0], word, 1)
+    for arab in rom['arabs']:
+        for translation in arab['translations']:
+            translation['source'] = translation['source'].replace(old, word)
+    return response
+
+
+def load_responses(words, recorded_path=None):
+    """Responses of words and the set of words whose response is synthetic.
+
+    The responses map each word to its response, or None if it has no
+    results.
+    """
+    with open(FIXTURES_PATH, encoding='utf-8') as f:
+        templates = json.load(f)
+    recorded = {}
+    if recorded_path and os.path.exists(recorded_path):
+        with open(recorded_path, encoding='utf-8') as f:
+            recorded = json.load(f)
+    responses, synthetic = {}, set()
+    for word in set(words):
+        if word in recorded:
+            responses[word] = recorded[word]
+        else:
+            responses[word] = _derived_response(word, templates)
+            synthetic.add(word)
+    return responses, synthetic
+
+
+def record_responses(words, path, pons):
+    """Look up words with a real Pons client and save the responses."""
+    recorded = {}
+    for word in sorted(set(words)):
+        try:
+            recorded[word] = pons.search(word)
+        except NoResultsError:
+            recorded[word] = None
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(recorded, f, ensure_ascii=False)
+    return recorded
+
+
+class ReplayPons(Pons):
+    """Pons client answering from recorded responses instead of the api."""
+
+    def __init__(self, responses, cache=None):
+        super().__init__(key='replay', cache=cache)
+        self.responses = responses
+
+    def _search(self, word):
+        response = self.responses.get(word)
+        if response is None:
+            raise NoResultsError("No results could be found for the given word")
+        return response
+
+
+def fake_post(number, word):
+    return Post(f'p{number:x}', word)
+
+
+def fake_reddit(words, subreddit='Sprache'):
+    """Reddit whose subreddit has a newest post asking for every word."""
+    posts = [fake_post(number, word) for number, word in enumerate(words)]
+    return Reddit({subreddit: Subreddit(posts)})
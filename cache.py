@@ -0,0 +1,181 @@
+import sqlite3
+import os
+import json
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from exceptions import NoResultsError, TranslationException
+
+DB_PATH = os.path.join(os.path.dirname(__file__), 'db')
+
+# Negative entries remember why a word could not be looked up, so the same
+# failure can be raised again without asking Pons.
+ERROR_TO_EXCEPTION = {
+    'no_results': NoResultsError,
+    'translation': TranslationException,
+}
+EXCEPTION_TO_ERROR = {exc: key for key, exc in ERROR_TO_EXCEPTION.items()}
+
+
+def normalize_word(word):
+    """Key used to store a word, so 'Hört ' and 'Hört' share an entry.
+
+    Case is kept: 'Reich' and 'reich' are different words.
+    """
+    return unicodedata.normalize('NFC', word).strip()
+
+
+class CacheEntry(object):
+    """Cached lookup. Either holds a result or the error it produced."""
+    __slots__ = ('result', 'error', 'message', 'expires')
+
+    def __init__(self, result=None, error=None, message=None, expires=0):
+        self.result = result
+        self.error = error
+        self.message = message
+        self.expires = expires
+
+    @property
+    def is_negative(self):
+        return self.error is not None
+
+    def raise_error(self):
+        raise ERROR_TO_EXCEPTION[self.error](self.message)
+
+
+class LookupCache(object):
+    """Two tier cache for dictionary lookups.
+
+    Entries live in an in-memory LRU and in an sqlite table keyed on the
+    normalized word, so lookups survive restarts of the bot. Both tiers
+    honour the entry ttl and are bounded in size; the least recently used
+    entries are evicted first. It is safe to share between threads.
+    """
+    TTL = 30 * 24 * 60 * 60
+    NEGATIVE_TTL = 24 * 60 * 60
+    MEMORY_SIZE = 1024
+    DB_SIZE = 50000
+
+    def __init__(self, path=os.path.join(DB_PATH, 'cache.db'), ttl=TTL,
+                 negative_ttl=NEGATIVE_TTL, memory_size=MEMORY_SIZE,
+                 db_size=DB_SIZE, clock=time.time):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self.db_size = db_size
+        self.clock = clock
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+        self.db_connection = sqlite3.connect(path, check_same_thread=False)
+        # Several processes may share the cache.
+        self.db_connection.execute('PRAGMA journal_mode=WAL')
+        self.db_connection.execute('''CREATE TABLE IF NOT EXISTS lookups(
+            word TEXT PRIMARY KEY, result TEXT, error TEXT, message TEXT,
+            expires REAL, accessed REAL)''')
+        self.db_connection.execute(
+            'CREATE INDEX IF NOT EXISTS lookups_accessed ON lookups(accessed)')
+        self.db_connection.execute(
+            'CREATE INDEX IF NOT EXISTS lookups_expires ON lookups(expires)')
+        self.db_connection.commit()
+
+    def get(self, word):
+        """Return the CacheEntry of word or None if it is not cached."""
+        with self.lock:
+            key = normalize_word(word)
+            now = self.clock()
+            entry = self.memory.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self.memory.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                del self.memory[key]
+
+            row = self.db_connection.execute(
+                'SELECT result, error, message, expires FROM lookups WHERE word = ?',
+                (key,)).fetchone()
+            if row is None or row[3] <= now:
+                if row is not None:
+                    self.db_connection.execute(
+                        'DELETE FROM lookups WHERE word = ?', (key,))
+                    self.db_connection.commit()
+                self.misses += 1
+                return None
+
+            result, error, message, expires = row
+            entry = CacheEntry(json.loads(result) if result else None,
+                               error, message, expires)
+            self.db_connection.execute(
+                'UPDATE lookups SET accessed = ? WHERE word = ?', (now, key))
+            self.db_connection.commit()
+            self._remember(key, entry)
+            self.hits += 1
+            self.db_hits += 1
+            return entry
+
+    def put(self, word, result):
+        """Cache a successful lookup."""
+        self._store(word, CacheEntry(result=result,
+                                     expires=self.clock() + self.ttl))
+
+    def put_error(self, word, exception):
+        """Cache a failed lookup, only for errors that will not go away."""
+        error = EXCEPTION_TO_ERROR.get(type(exception))
+        if error is None:
+            return
+        self._store(word, CacheEntry(error=error, message=str(exception),
+                                     expires=self.clock() + self.negative_ttl))
+
+    def invalidate(self, word):
+        with self.lock:
+            key = normalize_word(word)
+            self.memory.pop(key, None)
+            self.db_connection.execute('DELETE FROM lookups WHERE word = ?', (key,))
+            self.db_connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.db_connection.close()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / lookups if lookups else 0.0,
+            'memory_size': len(self.memory),
+        }
+
+    def _store(self, word, entry):
+        with self.lock:
+            key = normalize_word(word)
+            now = self.clock()
+            result = json.dumps(entry.result) if entry.result is not None else None
+            self.db_connection.execute(
+                '''INSERT OR REPLACE INTO lookups(
+                word, result, error, message, expires, accessed)
+                VALUES (?, ?, ?, ?, ?, ?)''',
+                (key, result, entry.error, entry.message, entry.expires, now))
+            self._evict_db(now)
+            self.db_connection.commit()
+            self._remember(key, entry)
+
+    def _remember(self, key, entry):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def _evict_db(self, now):
+        self.db_connection.execute('DELETE FROM lookups WHERE expires <= ?',
+                                   (now,))
+        self.db_connection.execute(
+            '''DELETE FROM lookups WHERE word IN (
+            SELECT word FROM lookups ORDER BY accessed DESC LIMIT -1 OFFSET ?)''',
+            (self.db_size,))
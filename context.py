@@ -0,0 +1,88 @@
+import os
+import threading
+
+from cache import LookupCache
+from metrics import REGISTRY
+from pons import Pons
+from storage import PostStore
+from wordindex import WordIndex
+
+DB_PATH = os.path.join(os.path.dirname(__file__), 'db')
+
+
+class AppContext(object):
+    """Clients and connections shared by the bots of a process.
+
+    Nothing is created until it is first used, so importing the bot or
+    building a context needs neither network nor credentials; praw and
+    requests are only imported once a reddit client or a Pons session is
+    created. Every resource is created once and shared by whoever uses
+    the context. `close` flushes and closes what was opened; the context
+    can also be used as a context manager.
+
+    Resources passed as keyword arguments, e.g. `reddit=FakeReddit()`, are
+    used instead of creating them.
+    """
+
+    def __init__(self, site_name='DeutscherBot', db_path=DB_PATH,
+                 pons_key=None, **resources):
+        self.site_name = site_name
+        self.db_path = db_path
+        self.pons_key = pons_key
+        self.lock = threading.RLock()
+        self.resources = resources
+
+    def _get(self, name, factory):
+        resource = self.resources.get(name)
+        if resource is None:
+            with self.lock:
+                resource = self.resources.get(name)
+                if resource is None:
+                    resource = self.resources[name] = factory()
+        return resource
+
+    @property
+    def reddit(self):
+        def connect():
+            import praw
+            return praw.Reddit(self.site_name)
+        return self._get('reddit', connect)
+
+    @property
+    def store(self):
+        return self._get('store', lambda: PostStore(
+            os.path.join(self.db_path, 'posts2.db')))
+
+    @property
+    def cache(self):
+        def open_cache():
+            cache = LookupCache(os.path.join(self.db_path, 'cache.db'))
+            REGISTRY.gauge('lookup_cache_hit_ratio',
+                           lambda: cache.stats()['hit_ratio'])
+            REGISTRY.gauge('lookup_cache_hits', lambda: cache.hits)
+            REGISTRY.gauge('lookup_cache_misses', lambda: cache.misses)
+            return cache
+        return self._get('cache', open_cache)
+
+    @property
+    def index(self):
+        return self._get('index', lambda: WordIndex(
+            os.path.join(self.db_path, 'words.db')))
+
+    @property
+    def pons(self):
+        return self._get('pons', lambda: Pons(key=self.pons_key,
+                                              cache=self.cache))
+
+    def close(self):
+        with self.lock:
+            resources, self.resources = self.resources, {}
+        for name in ('store', 'cache', 'index', 'pons'):
+            if name in resources:
+                resources[name].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
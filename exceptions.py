@@ -10,6 +10,18 @@ class SearchError(DeutscherBotException):
     # Request for word search was not successfull (status !=200 )
     pass
 
+class NoResultsError(SearchError):
+    # Search was successful but the dictionary has no entry for the word.
+    pass
+
 class TranslationException(DeutscherBotException):
     # Word search result was a translation instead of a definition.
-    pass
\ No newline at end of file
+    pass
+
+# Errors that will happen again if the same word is searched.
+PERMANENT_ERRORS = (NoResultsError, TranslationException)
+
+def is_permanent(exception):
+    # search_word wraps the errors of the search, look at the cause too.
+    return isinstance(exception, PERMANENT_ERRORS) or isinstance(
+        exception.__cause__, PERMANENT_ERRORS)
\ No newline at end of file
@@ -1,56 +1,25 @@
-import requests
-import re
-from datetime import datetime as d
-import sqlite3
-import os
+from datetime import datetime as d, timedelta
 import json
-import time
-
-from lxml.html import fragments_fromstring, fragment_fromstring, HtmlElement
-from lxml import etree
-import praw
-
-import config
+import argparse
+
+from lxml.html import fragments_fromstring
+
+import parsing
+from context import AppContext
+from metrics import REGISTRY
+from pipeline import ScanPipeline, TokenBucket
+from pons import Pons
+from scheduler import Scheduler
+from watcher import Watcher
+from wordindex import build_index
 from exceptions import (
     DeutscherBotException,
-    CouldNotGetText,
     SearchError,
     TranslationException,
 )
-DB_PATH = os.path.join(os.path.dirname(__file__), 'db')
-
-STATUS_TO_REASON = {
-    200: "Request successful",
-    204: "No results could be found for the given word",
-    404: "The dictionary does not exist",
-    403: "Supplied credentials could not be verified, or access to dictionary denied",
-    500: "A server error has occurred", None: "Unknown error (sorry)"
-}
-
-class Pons(object):
-    API_BASE_URL = 'https://api.pons.com/v1/dictionary'
-    LANGUAGE = 'l'
-    SEARCH_STRING = 'q'
-    INPUT_LANG = 'in'
-    SEARCH_URL = "https://en.pons.com/translate?q={word}&l=deen&in=de&language=en"
-    auth = {'X-Secret': config.PONS_KEY}
-
-    def search(self, word):
-        """Receives a word and returns the result of pons dictionary."""
-        params = ((Pons.LANGUAGE, 'deen'), (Pons.SEARCH_STRING, word),
-                  (Pons.INPUT_LANG, 'de'), ('language', 'en'))
-        response = requests.get(Pons.API_BASE_URL, headers=Pons.auth,
-                                params=params)
-        status = response.status_code
-        if status == 200:
-            return response.json()[0]
-        else:
-            error_msg = STATUS_TO_REASON.get(status)
-            raise SearchError(error_msg)
 
 class DeutscherBot():
     """Given a word it returns it's gender, translation, and a usage example."""
-    dbot = praw.Reddit("DeutscherBot")
     BREAK_LINE = '\n\n'
     BLANK_LINE = BREAK_LINE + '&nbsp;' + BREAK_LINE
     COMMENT_TEMPLATE = (
@@ -59,38 +28,94 @@ class DeutscherBot():
         "{source_link}" # + {example}
         )
 
-    db_connection = sqlite3.connect(os.path.join(DB_PATH, 'posts2.db'),
-                                    detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-
-    def __init__(self, subreddit='DeutschesBot', create_db = False):
-        self.pons = Pons()
-        self.subreddit = self.dbot.subreddit(subreddit)
-        self.db_cursor = self.db_connection.cursor()
-        if create_db:
-            self.db_cursor.execute('''CREATE TABLE posts(
-                post_id, link, word, translation, raw_result, date, subreddit)''')
-
-    def scan_posts(self, cant=5):
-        print(f"Visting /r/{self.subreddit}")
-        for post in self.subreddit.new(limit=cant):
-            print(f"Visiting {post.title}")
-            if not self.visited_db(post):
-                word = self._get_word_to_search(post)
-                word_details = self.search_word(word)
-                definition = self.prepare_comment(word_details)
-                post.reply(definition)
-                print(f"Replied on https://reddit.com/{post.id}")
-                self.add_to_db(post, word_details)
-                delay = 20
+    LOOKUP_WORKERS = 8
+    REPLIES_PER_MINUTE = 3
+
+    def __init__(self, subreddit='DeutschesBot', context=None):
+        self.subreddit_name = subreddit
+        self.context = context or AppContext()
+        self.reply_limiter = TokenBucket(rate=self.REPLIES_PER_MINUTE / 60)
+        self._subreddit = None
+
+    @property
+    def dbot(self):
+        return self.context.reddit
+
+    @property
+    def subreddit(self):
+        if self._subreddit is None:
+            self._subreddit = self.dbot.subreddit(self.subreddit_name)
+        return self._subreddit
+
+    @property
+    def pons(self):
+        return self.context.pons
+
+    @property
+    def store(self):
+        return self.context.store
+
+    @property
+    def index(self):
+        return self.context.index
+
+    def scan_posts(self, cant=5, workers=LOOKUP_WORKERS):
+        """Reply to the newest unvisited posts of the subreddit.
+
+        Words are looked up concurrently and replies are paced by
+        reply_limiter instead of sleeping after every post.
+        """
+        print(f"Visting /r/{self.subreddit_name}")
+        with REGISTRY.timer('reddit_listing'):
+            listing = list(self.subreddit.new(limit=cant))
+        with REGISTRY.timer('visited_db'):
+            new_ids = set(self.store.new_post_ids(post.id for post in listing))
+        posts = []
+        for post in listing:
+            if post.id in new_ids:
+                posts.append(post)
             else:
                 print(f"Skipping '{post.title}', already visited")
-                delay = 5
-
-            print(f"Sleeping for {delay} seconds...")
-            time.sleep(delay)
 
+        pipeline = ScanPipeline(self.lookup_post, self.reply_post,
+                                self.reply_limiter, workers=workers,
+                                on_error=self.add_failure_to_db)
+        try:
+            pipeline.run(posts)
+        finally:
+            self.store.flush()
         print("My job has ended")
 
+    def lookup_post(self, post):
+        return self.lookup_word(self._get_word_to_search(post))
+
+    def lookup_word(self, word):
+        """Return the word details and comment for word.
+
+        Precomputed words are served from the index without a lookup.
+        """
+        indexed = self.index.get(word)
+        if indexed is not None:
+            REGISTRY.inc('word_index_hits')
+            return indexed
+        word_details = self.search_word(word)
+        return word_details, self.prepare_comment(word_details)
+
+    def reply_post(self, post, lookup_result):
+        word_details, definition = lookup_result
+        if not self.store.claim(post.id, d.now()):
+            print(f"Skipping '{post.title}', claimed by another bot")
+            return
+        try:
+            with REGISTRY.timer('reply'):
+                post.reply(definition)
+        except Exception:
+            self.store.release(post.id)
+            raise
+        print(f"Replied on https://reddit.com/{post.id}")
+        self.reply_limiter.update_from_limits(self.dbot.auth.limits)
+        self.add_to_db(post, word_details)
+
     def _get_word_to_search(self, post):
         """Extract last word from post title.
 
@@ -103,52 +128,27 @@ class DeutscherBot():
         word = words[-1].strip()
         return word
 
+    @REGISTRY.timed('search_word')
     def search_word(self, s_word):
-        search_result = dict()
         try:
             result = self.pons.search(s_word)
-        except SearchError:
-            raise DeutscherBotException(f"Error searching {s_word}")
+        except SearchError as e:
+            raise DeutscherBotException(f"Error searching {s_word}") from e
 
         # Get Most relevant result.
-        result = result['hits'][0]
-        if result['type'] == 'entry':
-            definition = result['roms'][0]
-        else:
-            raise TranslationException("Translations are not yet supported")
-        # Get result word
-        word = definition['headword'].replace('·','') # remove syllable separator if present
-        search_result['word'] = word
-
-        # Get word class, noun|verb|adverb|adj
-        wordclass = definition.get('wordclass')
-        if wordclass:
-            search_result['word_type'] = wordclass
-
-        # Get plural, phonetics and other metadata.
-        word_metadata = self.get_word_metadata(definition['headword_full'])
-        search_result['metadata'] = word_metadata
-
-        gender = word_metadata['genus'] if wordclass == 'noun' else None # replace with get
-        if gender:
-            search_result['gender'] = gender
-
-        translation = definition['arabs'][0]['translations'][0]
-        if translation:
-            search_result['translation'] = self.get_text_from_irregular_string(
-                translation['target'])
-
-        example = self.get_example(definition)
-        if self.get_example(definition):
-            search_result['example'] = example
-
-        return search_result
+        try:
+            return parsing.parse_hit(result['hits'][0])
+        except TranslationException as error:
+            if self.pons.cache is not None:
+                self.pons.cache.put_error(s_word, error)
+            raise
 
     LETTER_TO_ARTICLE_MAPPER = {
         'nt': 'das',
         'm': 'der',
         'f': 'die'
     }
+    @REGISTRY.timed('prepare_comment')
     def prepare_comment(self, word_result):
         try:
             article = self.LETTER_TO_ARTICLE_MAPPER[word_result.get('gender', '')]
@@ -161,7 +161,7 @@ class DeutscherBot():
         phonetics = str(word_result['metadata'].get('phonetics', ''))
         translation = word_result['translation']
         source = self.script(self.format_link(
-            "PONS-reference", self.pons.SEARCH_URL.format(word=word)))
+            "PONS-reference", Pons.SEARCH_URL.format(word=word)))
         # Add example if there is one, if not put second translation?
         return self.COMMENT_TEMPLATE.format(
             article_and_word=self.bold(word_w_article),
@@ -173,19 +173,7 @@ class DeutscherBot():
         )
 
     def get_example(self, adefinition):
-        # filter translation which has phrases as header
-        phrase = list(filter(
-            lambda entry: entry['header'] == "Phrases:",
-            adefinition['arabs']))
-        if phrase:
-            translations = phrase[0]['translations']
-            translation = translations[0]
-            source = self.get_text_from_irregular_string(translation['source'])
-            target = self.get_target_text(translation['target'])
-            return (source, target)
-        else:
-            # no translation example was found
-            return None
+        return parsing.example(adefinition)
 
     # DEPRECATED
     def get_source_text(self, astr):
@@ -199,8 +187,7 @@ class DeutscherBot():
 
         Consider improving intelligence and parsing rest of string in italics..
         """
-        html_tags = '<[^>]*>'
-        return re.sub(html_tags, '', astr)
+        return parsing.strip_tags(astr)
 
     def get_text_from_irregular_string(self, astr):
         """"Tries to correctly format a string with embedded html.
@@ -210,52 +197,30 @@ class DeutscherBot():
 
         As seen in the example, inner text is wrapped in asteriscs
         """
-        string_pieces = fragments_fromstring(astr)
-        text = ""
-        for elem in string_pieces:
-            if isinstance(elem, str):
-                text += elem
-            elif isinstance(elem, HtmlElement):
-                inner_text = elem.text_content()
-                text += self.parenthesis(self.italics(inner_text))
-            else:
-                raise CouldNotGetText(f"No method to extract text from {elem}"
-                                f" of type {type(elem)} to string")
-
-        return text
+        return parsing.text_from_irregular_string(astr)
 
     def get_word_metadata(self, fullword):
         """Get dictionary of attributes associated with a word.
 
         Build dictionary of word details from raw string with invalid html.
         """
-        # Build list of html elements, ignoring leading string.
-        html_elem = fragments_fromstring(fullword)[1:]
-        metadata = {}
-        for elem in html_elem:
-            key = elem.get('class')
-            if key not in metadata:
-                metadata[key] = elem.text_content()
-
-        return metadata
+        return parsing.word_metadata(fullword)
 
+    @REGISTRY.timed('add_to_db')
     def add_to_db(self, post, word_details):
         word = word_details['word']
         translation = word_details['translation']
         raw_result = json.dumps(word_details)
         now = d.now()
-        self.db_cursor.execute("""INSERT INTO posts(
-            post_id, link, word, translation, raw_result, date, subreddit)
-            VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (post.id, post.url, word, translation, raw_result, now, str(self.subreddit)))
+        self.store.add_post(post.id, post.url, word, translation, raw_result,
+                            now, self.subreddit_name)
 
-        self.db_connection.commit()
+    def add_failure_to_db(self, post, exception):
+        self.store.add_failure(post.id, self.subreddit_name, exception)
 
+    @REGISTRY.timed('visited_db')
     def visited_db(self, post):
-        self.db_cursor.execute("""SELECT * FROM posts WHERE EXISTS 
-                               (SELECT 1 FROM posts 
-                               WHERE post_id = (?))""", (post.id,))
-        return bool(self.db_cursor.fetchone())
+        return self.store.visited(post.id)
 
     def format_link(self, visible_name, url):
         return f"[{visible_name}]({url})"
@@ -272,4 +237,100 @@ class DeutscherBot():
     def parenthesis(self, astr):
         return f"({astr})"
 
-DeutscherBot("Sprache").scan_posts(cant=20)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=DeutscherBot.__doc__)
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="Write stage metrics to PATH, as json if it "
+                        "ends with .json and in Prometheus format otherwise")
+    commands = parser.add_subparsers(dest='command', required=True)
+    scan = commands.add_parser('scan', help="Reply to the newest posts once")
+    scan.add_argument('--subreddit', default='Sprache')
+    scan.add_argument('--cant', type=int, default=20,
+                      help="Number of posts to visit")
+    watch = commands.add_parser('watch', help="Reply to new posts as they come")
+    watch.add_argument('--subreddit', default='Sprache')
+    bulk = commands.add_parser(
+        'bulk', help="Precompute the comments of a list of words")
+    bulk.add_argument('words', type=argparse.FileType(encoding='utf-8'),
+                      help="File with one word per line")
+    bulk.add_argument('--workers', type=int, default=DeutscherBot.LOOKUP_WORKERS)
+    schedule = commands.add_parser(
+        'schedule', help="Reply to the new posts of several subreddits")
+    schedule.add_argument('--subreddits', nargs='+',
+                          default=['Sprache', 'DeutschesBot', 'German'])
+    schedule.add_argument('--cant', type=int, default=20,
+                          help="Number of posts to visit per subreddit")
+    schedule.add_argument('--processes', type=int,
+                          help="Lookup processes, one per core by default")
+    schedule.add_argument('--replies-per-minute', type=float,
+                          default=Scheduler.REPLIES_PER_MINUTE,
+                          help="Reply budget shared by all subreddits")
+    schedule.add_argument('--interval', type=int, default=Scheduler.INTERVAL,
+                          help="Seconds between rounds")
+    schedule.add_argument('--once', action='store_true',
+                          help="Run a single round and exit")
+    stats = commands.add_parser(
+        'stats', help="Top words, posts and failures per subreddit")
+    stats.add_argument('--top', type=int, default=10)
+    archive = commands.add_parser(
+        'archive', help="Compact posts older than some days into the archive")
+    archive.add_argument('--days', type=int, default=365)
+    args = parser.parse_args(argv)
+
+    with AppContext() as context:
+        try:
+            run_command(args, context)
+        finally:
+            if args.metrics:
+                REGISTRY.write(args.metrics)
+
+
+def run_command(args, context):
+    if args.command == 'stats':
+        print_stats(context.store.stats(top=args.top))
+        return
+    if args.command == 'archive':
+        archived = context.store.archive(d.now() - timedelta(days=args.days))
+        print(f"Archived {archived} posts")
+        return
+
+    if args.command == 'bulk':
+        bot = DeutscherBot(context=context)
+        build_index(bot, args.words.read().split(), bot.index,
+                    workers=args.workers)
+        return
+
+    if args.command == 'schedule':
+        bots = [DeutscherBot(subreddit, context=context)
+                for subreddit in args.subreddits]
+        scheduler = Scheduler(bots, processes=args.processes, cant=args.cant,
+                              replies_per_minute=args.replies_per_minute,
+                              interval=args.interval)
+        scheduler.install_signal_handlers()
+        scheduler.run(once=args.once)
+        return
+
+    bot = DeutscherBot(args.subreddit, context=context)
+    if args.command == 'scan':
+        bot.scan_posts(cant=args.cant)
+    elif args.command == 'watch':
+        watcher = Watcher(bot, metrics_path=args.metrics)
+        watcher.install_signal_handlers()
+        watcher.run()
+
+
+def print_stats(stats):
+    print("Top words")
+    for word, posts in stats['top_words']:
+        print(f"  {word:<30} {posts}")
+    print("Subreddits")
+    for subreddit, posts, failures in stats['subreddits']:
+        print(f"  /r/{subreddit:<26} {posts} posts, {failures} failed lookups")
+    print("Failed lookups")
+    for subreddit, exception, failures in stats['failures']:
+        print(f"  /r/{subreddit:<26} {exception}: {failures}")
+
+
+if __name__ == '__main__':
+    main()
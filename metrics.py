@@ -0,0 +1,186 @@
+"""Latency histograms and counters of the stages of the bot.
+
+Stages are timed with `REGISTRY.timer(stage)` or the `REGISTRY.timed(stage)`
+decorator. A timed stage that raises counts the error by exception class.
+Everything can be exported as json or in the Prometheus text format.
+"""
+import json
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds in seconds of the latency buckets.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+PREFIX = 'deutscherbot_'
+
+
+class Histogram(object):
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def to_dict(self):
+        with self.lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, buckets = 0, {}
+        for bound, bucket_count in zip(self.buckets + ('+Inf',), counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        return {'count': count, 'sum': total, 'buckets': buckets}
+
+
+class Timer(object):
+    __slots__ = ('metrics', 'stage', 'start')
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+        if exc_type is not None:
+            self.metrics.inc('errors', stage=self.stage,
+                             exception=exc_type.__name__)
+        return False
+
+
+class Metrics(object):
+
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(stage, Histogram())
+        histogram.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def gauge(self, name, function):
+        """Register a gauge whose value is read from function on export."""
+        self.gauges[name] = function
+
+    def timer(self, stage):
+        return Timer(self, stage)
+
+    def timed(self, stage):
+        """Decorator timing every call of the decorated function."""
+        def decorator(function):
+            def wrapper(*args, **kwargs):
+                with Timer(self, stage):
+                    return function(*args, **kwargs)
+            wrapper.__name__ = function.__name__
+            wrapper.__doc__ = function.__doc__
+            wrapper.__wrapped__ = function
+            return wrapper
+        return decorator
+
+    def value(self, name, **labels):
+        """Current value of a counter."""
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {}
+            self.counters = {}
+
+    def drain(self):
+        """Return the histograms and counters recorded so far and reset them.
+
+        The result can be pickled and merged into the registry of another
+        process.
+        """
+        with self.lock:
+            histograms, self.histograms = self.histograms, {}
+            counters, self.counters = self.counters, {}
+        return {
+            'histograms': {stage: (histogram.counts, histogram.sum,
+                                   histogram.count)
+                           for stage, histogram in histograms.items()},
+            'counters': counters,
+        }
+
+    def merge(self, drained):
+        """Add the result of `drain` of another registry to this one."""
+        for stage, (counts, total, count) in drained['histograms'].items():
+            with self.lock:
+                histogram = self.histograms.setdefault(stage, Histogram())
+            with histogram.lock:
+                histogram.counts = [a + b for a, b in zip(histogram.counts, counts)]
+                histogram.sum += total
+                histogram.count += count
+        with self.lock:
+            for key, value in drained['counters'].items():
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    def to_dict(self):
+        with self.lock:
+            histograms = dict(self.histograms)
+            counters = dict(self.counters)
+        return {
+            'latency_seconds': {stage: histogram.to_dict()
+                                for stage, histogram in histograms.items()},
+            'counters': [dict(labels, name=name, value=value)
+                         for (name, labels), value in counters.items()],
+            'gauges': {name: function()
+                       for name, function in self.gauges.items()},
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self):
+        data = self.to_dict()
+        lines = [f'# TYPE {PREFIX}stage_latency_seconds histogram']
+        for stage, histogram in data['latency_seconds'].items():
+            for bound, count in histogram['buckets'].items():
+                lines.append(f'{PREFIX}stage_latency_seconds_bucket'
+                             f'{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{PREFIX}stage_latency_seconds_sum'
+                         f'{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{PREFIX}stage_latency_seconds_count'
+                         f'{{stage="{stage}"}} {histogram["count"]}')
+        typed = set()
+        for counter in data['counters']:
+            name, value = counter.pop('name'), counter.pop('value')
+            if name not in typed:
+                typed.add(name)
+                lines.append(f'# TYPE {PREFIX}{name}_total counter')
+            labels = ','.join(f'{key}="{label}"' for key, label in counter.items())
+            lines.append(f'{PREFIX}{name}_total{{{labels}}} {value}')
+        for name, value in data['gauges'].items():
+            lines.append(f'# TYPE {PREFIX}{name} gauge')
+            lines.append(f'{PREFIX}{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write the metrics to path, as json if it ends with .json"""
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        with open(path, 'w') as f:
+            f.write(content)
+
+
+REGISTRY = Metrics()
@@ -0,0 +1,92 @@
+"""Extract word details from the html fragments of a Pons result.
+
+Each hit is walked once: the headword fragment is parsed a single time to
+get its metadata and every translation fragment is parsed at most once.
+"""
+import re
+
+from lxml.html import fragments_fromstring, HtmlElement
+
+from exceptions import CouldNotGetText, TranslationException
+
+HTML_TAGS = re.compile('<[^>]*>')
+SYLLABLE_SEPARATOR = '·'
+PHRASES_HEADER = "Phrases:"
+
+
+def strip_tags(astr):
+    """Removes html tags from string that represents translation"""
+    return HTML_TAGS.sub('', astr)
+
+
+def text_from_irregular_string(astr):
+    """Text of a string with embedded html, inner text as '(*inner*)'.
+
+        input: 'text outside <span class="info">text<acronym title="plural">inside</acronym></span>'
+        output: 'text outside (*text inside*)'
+    """
+    pieces = []
+    for elem in fragments_fromstring(astr):
+        if isinstance(elem, str):
+            pieces.append(elem)
+        elif isinstance(elem, HtmlElement):
+            pieces.append(f"(*{elem.text_content()}*)")
+        else:
+            raise CouldNotGetText(f"No method to extract text from {elem}"
+                                  f" of type {type(elem)} to string")
+    return ''.join(pieces)
+
+
+def word_metadata(fullword):
+    """Dictionary of the classes of the elements of the headword and their text.
+
+    The leading string, the headword itself, is ignored.
+    """
+    metadata = {}
+    for elem in fragments_fromstring(fullword)[1:]:
+        key = elem.get('class')
+        if key not in metadata:
+            metadata[key] = elem.text_content()
+    return metadata
+
+
+def example(definition):
+    """(source, target) of the first phrase of a definition, or None."""
+    for arab in definition['arabs']:
+        if arab['header'] == PHRASES_HEADER:
+            translation = arab['translations'][0]
+            return (text_from_irregular_string(translation['source']),
+                    strip_tags(translation['target']))
+    return None
+
+
+def parse_hit(hit):
+    """Word details of a Pons hit.
+
+    Returns a dict with word, word_type, metadata, gender, translation and
+    example, leaving out the keys that are not present on the hit.
+    """
+    if hit['type'] != 'entry':
+        raise TranslationException("Translations are not yet supported")
+    definition = hit['roms'][0]
+
+    result = {'word': definition['headword'].replace(SYLLABLE_SEPARATOR, '')}
+    wordclass = definition.get('wordclass')
+    if wordclass:
+        result['word_type'] = wordclass
+
+    metadata = word_metadata(definition['headword_full'])
+    result['metadata'] = metadata
+    gender = metadata['genus'] if wordclass == 'noun' else None
+    if gender:
+        result['gender'] = gender
+
+    translation = definition['arabs'][0]['translations'][0]
+    if translation:
+        result['translation'] = text_from_irregular_string(translation['target'])
+
+    phrase = example(definition)
+    if phrase:
+        result['example'] = phrase
+
+    return result
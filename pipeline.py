@@ -0,0 +1,96 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class TokenBucket(object):
+    """Rate limiter that allows `rate` actions per second with bursts of up
+    to `capacity` actions.
+
+    Besides its own rate it can be paused until a given time, which is used
+    to honour the rate limit headers sent back by reddit.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic,
+                 sleep=time.sleep, wall_clock=time.time):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+        self.updated = clock()
+        self.paused_until = None
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until an action is allowed and consume a token for it."""
+        with self.lock:
+            if self.paused_until is not None:
+                delay = self.paused_until - self.wall_clock()
+                self.paused_until = None
+                if delay > 0:
+                    print(f"Rate limited by reddit, waiting {delay:.0f} seconds...")
+                    self.sleep(delay)
+            self._refill()
+            if self.tokens < 1:
+                self.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def pause_until(self, timestamp):
+        """Don't allow any action until the given unix timestamp."""
+        self.paused_until = timestamp
+
+    def update_from_limits(self, limits, reserve=1):
+        """Pause until the reset of reddit's window if we ran out of requests.
+
+        `limits` has the format of `praw.Reddit.auth.limits`.
+        """
+        remaining = limits.get('remaining')
+        reset = limits.get('reset_timestamp')
+        if remaining is not None and reset is not None and remaining <= reserve:
+            self.pause_until(reset)
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class ScanPipeline(object):
+    """Looks up posts concurrently and replies to them in order.
+
+    `lookup(post)` runs on a bounded pool of workers for every post at once.
+    `reply(post, result)` runs on the calling thread, in the order the posts
+    were given, each one waiting for a token of the limiter. Posts whose
+    lookup fails are passed to `on_error(post, exception)` if given.
+    """
+
+    def __init__(self, lookup, reply, limiter, workers=4, on_error=None):
+        self.lookup = lookup
+        self.reply = reply
+        self.on_error = on_error
+        self.limiter = limiter
+        self.workers = workers
+
+    def run(self, posts):
+        replied = []
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [(post, pool.submit(self.lookup, post)) for post in posts]
+            for post, future in futures:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Unexpected results too, so one bad post can't stop
+                    # every scan.
+                    print(f"Could not look up '{post.title}': {e!r}")
+                    if self.on_error is not None:
+                        self.on_error(post, e)
+                    continue
+                self.limiter.acquire()
+                self.reply(post, result)
+                replied.append(post)
+
+        return replied
@@ -0,0 +1,147 @@
+import threading
+from concurrent.futures import Future
+
+from cache import normalize_word
+from exceptions import NoResultsError, SearchError
+from metrics import REGISTRY
+
+STATUS_TO_REASON = {
+    200: "Request successful",
+    204: "No results could be found for the given word",
+    404: "The dictionary does not exist",
+    403: "Supplied credentials could not be verified, or access to dictionary denied",
+    429: "Too many requests were made to the dictionary",
+    500: "A server error has occurred", None: "Unknown error (sorry)"
+}
+
+class Pons(object):
+    """Client of the Pons dictionary api.
+
+    Requests go through one pooled session, so connections are reused
+    between lookups. requests is only imported once the session is
+    needed. Connection errors, 429 and 5xx responses are retried with
+    exponential backoff. Concurrent searches of the same word share a
+    single request.
+    """
+    API_BASE_URL = 'https://api.pons.com/v1/dictionary'
+    LANGUAGE = 'l'
+    SEARCH_STRING = 'q'
+    INPUT_LANG = 'in'
+    SEARCH_URL = "https://en.pons.com/translate?q={word}&l=deen&in=de&language=en"
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # Seconds to connect and to wait for the response.
+    TIMEOUT = (3.05, 10)
+
+    def __init__(self, key=None, cache=None, base_url=API_BASE_URL,
+                 timeout=TIMEOUT, retries=3, backoff_factor=0.5, pool_size=10):
+        self.key = key
+        self.cache = cache
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.lock = threading.Lock()
+        self.in_flight = {}
+        self._session = None
+
+    @property
+    def auth(self):
+        # Read the key on the first search so building a client is free.
+        if self.key is None:
+            import config
+            self.key = config.PONS_KEY
+        return {'X-Secret': self.key}
+
+    @property
+    def session(self):
+        with self.lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(total=self.retries,
+                              backoff_factor=self.backoff_factor,
+                              status_forcelist=self.RETRY_STATUSES,
+                              allowed_methods=['GET'],
+                              raise_on_status=False)
+                adapter = HTTPAdapter(pool_connections=1,
+                                      pool_maxsize=self.pool_size,
+                                      max_retries=retry)
+                session = requests.Session()
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+        return self._session
+
+    @REGISTRY.timed('pons_search')
+    def search(self, word):
+        """Receives a word and returns the result of pons dictionary.
+
+        If a cache is set, known words are served from it and words without
+        results fail without asking pons again.
+        """
+        if self.cache is None:
+            return self._coalesced_search(word)
+
+        entry = self.cache.get(word)
+        if entry is not None:
+            if entry.is_negative:
+                entry.raise_error()
+            return entry.result
+
+        return self._coalesced_search(word)
+
+    def _coalesced_search(self, word):
+        """Search word, waiting for the request in flight if there is one."""
+        key = normalize_word(word)
+        with self.lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._search(word)
+        except Exception as e:
+            if self.cache is not None and isinstance(e, NoResultsError):
+                self.cache.put_error(word, e)
+            future.set_exception(e)
+            raise
+        else:
+            if self.cache is not None:
+                self.cache.put(word, result)
+            future.set_result(result)
+            return result
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+
+    @REGISTRY.timed('pons_request')
+    def _search(self, word):
+        import requests
+
+        params = ((Pons.LANGUAGE, 'deen'), (Pons.SEARCH_STRING, word),
+                  (Pons.INPUT_LANG, 'de'), ('language', 'en'))
+        try:
+            response = self.session.get(self.base_url, headers=self.auth,
+                                        params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            raise SearchError(f"Request to pons failed: {e}") from e
+        status = response.status_code
+        if status == 200:
+            return response.json()[0]
+        elif status == 204:
+            raise NoResultsError(STATUS_TO_REASON[status])
+        else:
+            error_msg = STATUS_TO_REASON.get(status, STATUS_TO_REASON[None])
+            raise SearchError(error_msg)
+
+    def close(self):
+        with self.lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,176 @@
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import zip_longest
+
+from cache import normalize_word
+from context import AppContext
+from exceptions import DeutscherBotException
+from metrics import REGISTRY
+from pipeline import TokenBucket
+from watcher import Backoff
+
+# Bot of each lookup process, created by _init_worker.
+_worker_bot = None
+
+
+def _init_worker(db_path):
+    global _worker_bot
+    from main import DeutscherBot
+    # Forked workers start with a copy of the metrics of the scheduler,
+    # which would be merged back into it a second time.
+    REGISTRY.reset()
+    _worker_bot = DeutscherBot(context=AppContext(db_path=db_path))
+
+
+def _lookup_word(word):
+    """Look up word in a worker process.
+
+    Returns (result, error, metrics): the result of lookup_word or the
+    error it raised, and the metrics recorded by the worker for it, to be
+    merged into the registry of the scheduler.
+    """
+    cache = _worker_bot.context.cache
+    hits, misses = cache.hits, cache.misses
+    result = error = None
+    try:
+        result = _worker_bot.lookup_word(word)
+    except Exception as e:
+        # __cause__ doesn't survive pickling, send the wrapped search error.
+        error = e.__cause__ if isinstance(e.__cause__, DeutscherBotException) else e
+    REGISTRY.inc('worker_cache_hits', cache.hits - hits)
+    REGISTRY.inc('worker_cache_misses', cache.misses - misses)
+    return result, error, REGISTRY.drain()
+
+
+def cache_hit_ratio():
+    """Hit ratio of the lookup caches of the worker processes."""
+    hits = REGISTRY.value('worker_cache_hits')
+    lookups = hits + REGISTRY.value('worker_cache_misses')
+    return hits / lookups if lookups else 0.0
+
+
+def interleave(lists):
+    """Items of lists taking one of each list in turn."""
+    return [item for items in zip_longest(*lists) for item in items
+            if item is not None]
+
+
+class Scheduler(object):
+    """Replies to the new posts of several subreddits.
+
+    Every round lists the newest posts of each subreddit and skips the ones
+    in the shared posts database. Each distinct word of the remaining
+    posts is looked up once, on a pool of processes sharing the lookup
+    cache and word index, so words asked in several communities cost one
+    call to Pons. Replies take turns between subreddits and share a single
+    reply budget. Posts are claimed in the database before replying, so
+    schedulers in other processes never answer the same post.
+
+    `lookup(word)` runs on the pool and returns (result, error, metrics)
+    like _lookup_word; the metrics of the workers are merged into
+    REGISTRY. Errors of a round are retried with backoff in the next one.
+    """
+    INTERVAL = 60
+    REPLIES_PER_MINUTE = 3
+
+    def __init__(self, bots, processes=None, cant=20,
+                 replies_per_minute=REPLIES_PER_MINUTE, interval=INTERVAL,
+                 stop_event=None, lookup=_lookup_word):
+        self.bots = bots
+        self.context = bots[0].context
+        self.reply_limiter = TokenBucket(rate=replies_per_minute / 60)
+        for bot in self.bots:
+            bot.reply_limiter = self.reply_limiter
+        self.lookup = lookup
+        self.processes = processes
+        self.cant = cant
+        self.interval = interval
+        self.stop_event = stop_event or threading.Event()
+        self.backoff = Backoff()
+        REGISTRY.gauge('lookup_cache_hit_ratio', cache_hit_ratio)
+
+    def stop(self, *args):
+        print("Stopping scheduler...")
+        self.stop_event.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    def new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.processes,
+                                   initializer=_init_worker,
+                                   initargs=(self.context.db_path,))
+
+    def run(self, once=False):
+        pool = None
+        try:
+            while not self.stop_event.is_set():
+                if pool is None:
+                    pool = self.new_pool()
+                try:
+                    self.run_round(pool)
+                    self.backoff.reset()
+                    delay = self.interval
+                except Exception as e:
+                    # Reddit errors, RATELIMIT replies, errors of the workers
+                    # or a dead pool: wait and try again in the next round.
+                    if isinstance(e, BrokenProcessPool):
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        pool = None
+                    REGISTRY.inc('errors', stage='schedule',
+                                 exception=type(e).__name__)
+                    delay = self.backoff.next_delay()
+                    print(f"Error scheduling: {e!r}, retrying in {delay:.1f} seconds...")
+                if once:
+                    break
+                self.stop_event.wait(delay)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        print("My job has ended")
+
+    def run_round(self, pool):
+        """Reply to the new posts of every subreddit once."""
+        work = []
+        for bot in self.bots:
+            with REGISTRY.timer('reddit_listing'):
+                listing = list(bot.subreddit.new(limit=self.cant))
+            with REGISTRY.timer('visited_db'):
+                new_ids = set(bot.store.new_post_ids(post.id for post in listing))
+            work.append([(bot, post) for post in listing if post.id in new_ids])
+
+        futures = {}
+        merged = set()
+        for bot, post in interleave(work):
+            key = normalize_word(bot._get_word_to_search(post))
+            if key not in futures:
+                futures[key] = pool.submit(self.lookup,
+                                           bot._get_word_to_search(post))
+        print(f"Looking up {len(futures)} words for "
+              f"{sum(map(len, work))} posts")
+
+        try:
+            for bot, post in interleave(work):
+                if self.stop_event.is_set():
+                    break
+                key = normalize_word(bot._get_word_to_search(post))
+                lookup_result, error, metrics = futures[key].result()
+                if metrics and key not in merged:
+                    # Posts sharing a word share its metrics, merge them once.
+                    REGISTRY.merge(metrics)
+                    merged.add(key)
+                if error is not None:
+                    print(f"Could not look up '{post.title}': {error!r}")
+                    bot.add_failure_to_db(post, error)
+                    if isinstance(error, DeutscherBotException):
+                        continue
+                    raise error
+                self.reply_limiter.acquire()
+                bot.reply_post(post, lookup_result)
+        finally:
+            for future in futures.values():
+                future.cancel()
+            self.context.store.flush()
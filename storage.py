@@ -0,0 +1,287 @@
+import sqlite3
+import json
+import zlib
+
+from exceptions import is_permanent
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _dedup_posts(connection):
+    # Older runs could insert the same post twice, keep the first row.
+    connection.execute('''DELETE FROM posts WHERE rowid NOT IN (
+        SELECT MIN(rowid) FROM posts GROUP BY post_id)''')
+
+
+def _normalize_posts(connection):
+    # Dictionary entries move to the words table, posts keep a reference.
+    connection.execute('''CREATE TABLE IF NOT EXISTS words(
+        id INTEGER PRIMARY KEY, word TEXT UNIQUE, translation, details)''')
+    connection.execute('ALTER TABLE posts ADD COLUMN word_id INTEGER')
+    connection.execute('''INSERT OR IGNORE INTO words(word, translation, details)
+        SELECT word, translation, raw_result FROM posts
+        WHERE word IS NOT NULL ORDER BY rowid DESC''')
+    connection.execute('''UPDATE posts SET translation = NULL, raw_result = NULL,
+        word_id = (SELECT id FROM words WHERE words.word = posts.word)''')
+
+
+def _create_aggregates(connection):
+    connection.execute('''CREATE TABLE IF NOT EXISTS word_stats(
+        word_id INTEGER PRIMARY KEY, posts INTEGER)''')
+    connection.execute(
+        'CREATE INDEX IF NOT EXISTS word_stats_posts ON word_stats(posts)')
+    connection.execute('''CREATE TABLE IF NOT EXISTS subreddit_stats(
+        subreddit TEXT PRIMARY KEY, posts INTEGER DEFAULT 0,
+        failures INTEGER DEFAULT 0)''')
+    connection.execute('''CREATE TABLE IF NOT EXISTS failure_stats(
+        subreddit TEXT, exception TEXT, failures INTEGER,
+        PRIMARY KEY (subreddit, exception))''')
+    connection.execute('''INSERT INTO word_stats(word_id, posts)
+        SELECT word_id, COUNT(*) FROM posts WHERE word_id IS NOT NULL
+        GROUP BY word_id''')
+    connection.execute('''INSERT INTO subreddit_stats(subreddit, posts)
+        SELECT subreddit, COUNT(*) FROM posts WHERE subreddit IS NOT NULL
+        GROUP BY subreddit''')
+    # Every new post updates the aggregates, whatever code inserts it.
+    connection.execute('''CREATE TRIGGER IF NOT EXISTS posts_stats
+        AFTER INSERT ON posts BEGIN
+            INSERT INTO word_stats(word_id, posts)
+                SELECT NEW.word_id, 1 WHERE NEW.word_id IS NOT NULL
+                ON CONFLICT(word_id) DO UPDATE SET posts = posts + 1;
+            INSERT INTO subreddit_stats(subreddit, posts)
+                SELECT NEW.subreddit, 1 WHERE NEW.subreddit IS NOT NULL
+                ON CONFLICT(subreddit) DO UPDATE SET posts = posts + 1;
+        END''')
+
+
+# Each migration takes the database from version `index` to `index + 1`,
+# the current version is stored in sqlite's user_version pragma.
+MIGRATIONS = [
+    lambda connection: connection.execute('''CREATE TABLE IF NOT EXISTS posts(
+        post_id, link, word, translation, raw_result, date, subreddit)'''),
+    _dedup_posts,
+    lambda connection: connection.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS posts_post_id ON posts(post_id)'),
+    lambda connection: connection.execute(
+        'CREATE INDEX IF NOT EXISTS posts_word ON posts(word)'),
+    lambda connection: connection.execute(
+        'CREATE INDEX IF NOT EXISTS posts_date ON posts(date)'),
+    lambda connection: connection.execute('''CREATE TABLE IF NOT EXISTS checkpoints(
+        subreddit TEXT PRIMARY KEY, fullname TEXT, date)'''),
+    lambda connection: connection.execute('''CREATE TABLE IF NOT EXISTS claims(
+        post_id TEXT PRIMARY KEY, date)'''),
+    _normalize_posts,
+    _create_aggregates,
+    lambda connection: connection.execute('''CREATE TABLE IF NOT EXISTS archive(
+        id INTEGER PRIMARY KEY, first_date, last_date, rows INTEGER,
+        data BLOB)'''),
+    lambda connection: connection.execute('''CREATE TABLE IF NOT EXISTS failed_posts(
+        post_id TEXT PRIMARY KEY, subreddit, exception, attempts INTEGER,
+        permanent INTEGER)'''),
+]
+
+ARCHIVE_COLUMNS = ('post_id', 'link', 'word_id', 'date', 'subreddit')
+
+
+class PostStore(object):
+    """Posts the bot has replied to.
+
+    Inserts are buffered and written with a single executemany every
+    `batch_size` posts or when `flush` is called. The dictionary entry of
+    a post is stored once in the words table and referenced by the post.
+    Post counts per word and per subreddit and lookup failures are kept up
+    to date on every write, so `stats` never scans the posts.
+
+    Posts whose lookup failed are counted once. They are left out of the new
+    posts after a permanent failure; temporary ones are retried every time.
+    """
+    # Keep below sqlite's limit of host parameters per statement.
+    MAX_PARAMS = 500
+    BATCH_SIZE = 20
+
+    def __init__(self, path, batch_size=BATCH_SIZE):
+        self.batch_size = batch_size
+        self.pending = []
+        self.db_connection = sqlite3.connect(
+            path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        self.db_connection.execute('PRAGMA journal_mode=WAL')
+        self.db_connection.execute('PRAGMA synchronous=NORMAL')
+        self.migrate()
+
+    def migrate(self):
+        """Apply the migrations the database doesn't have yet."""
+        version = self.db_connection.execute('PRAGMA user_version').fetchone()[0]
+        for index, migration in enumerate(MIGRATIONS[version:], start=version):
+            with self.db_connection:
+                migration(self.db_connection)
+                self.db_connection.execute(f'PRAGMA user_version = {index + 1}')
+
+    def visited(self, post_id):
+        return not self.new_post_ids([post_id])
+
+    def new_post_ids(self, post_ids):
+        """Return the post ids not yet stored, claimed nor given up on, in
+        the order they were given.
+
+        Claims cover the posts replied before a crash lost them from the
+        pending batch.
+        """
+        post_ids = list(post_ids)
+        seen = {row[0] for row in self.pending}
+        for chunk in _chunks(post_ids, self.MAX_PARAMS):
+            placeholders = ', '.join('?' * len(chunk))
+            rows = self.db_connection.execute(
+                f'''SELECT post_id FROM posts WHERE post_id IN ({placeholders})
+                UNION SELECT post_id FROM claims WHERE post_id IN ({placeholders})
+                UNION SELECT post_id FROM failed_posts
+                WHERE post_id IN ({placeholders})
+                AND permanent''',
+                chunk * 3)
+            seen.update(row[0] for row in rows)
+        return [post_id for post_id in post_ids if post_id not in seen]
+
+    def add_post(self, post_id, link, word, translation, raw_result, date,
+                 subreddit):
+        self.pending.append(
+            (post_id, link, word, translation, raw_result, date, subreddit))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered posts in one transaction."""
+        if not self.pending:
+            return
+        with self.db_connection:
+            self.db_connection.executemany(
+                '''INSERT INTO words(word, translation, details) VALUES (?, ?, ?)
+                ON CONFLICT(word) DO UPDATE SET translation = excluded.translation,
+                details = excluded.details''',
+                [(word, translation, raw_result) for
+                 _, _, word, translation, raw_result, _, _ in self.pending])
+            self.db_connection.executemany(
+                '''INSERT OR IGNORE INTO posts(
+                post_id, link, word, word_id, date, subreddit)
+                VALUES (?, ?, ?, (SELECT id FROM words WHERE word = ?), ?, ?)''',
+                [(post_id, link, word, word, date, subreddit) for
+                 post_id, link, word, _, _, date, subreddit in self.pending])
+        self.pending = []
+
+    def add_failure(self, post_id, subreddit, exception):
+        """Record that the word of a post couldn't be looked up.
+
+        The failure is labelled with the exception that caused it, e.g. the
+        SearchError wrapped by search_word. Only the first failure of a post
+        is counted in the aggregates.
+        """
+        cause = exception.__cause__ if exception.__cause__ is not None else exception
+        label = type(cause).__name__
+        permanent = is_permanent(exception)
+        with self.db_connection:
+            cursor = self.db_connection.execute(
+                '''INSERT OR IGNORE INTO failed_posts VALUES (?, ?, ?, 1, ?)''',
+                (post_id, subreddit, label, permanent))
+            if cursor.rowcount != 1:
+                self.db_connection.execute(
+                    '''UPDATE failed_posts SET attempts = attempts + 1,
+                    exception = ?, permanent = ? WHERE post_id = ?''',
+                    (label, permanent, post_id))
+                return
+            self.db_connection.execute(
+                '''INSERT INTO failure_stats(subreddit, exception, failures)
+                VALUES (?, ?, 1) ON CONFLICT(subreddit, exception)
+                DO UPDATE SET failures = failures + 1''',
+                (subreddit, label))
+            self.db_connection.execute(
+                '''INSERT INTO subreddit_stats(subreddit, failures) VALUES (?, 1)
+                ON CONFLICT(subreddit) DO UPDATE SET failures = failures + 1''',
+                (subreddit,))
+
+    def archive(self, before):
+        """Compact posts older than the `before` date into the archive.
+
+        The rows are stored column by column in one zlib compressed chunk.
+        Only the post_id of archived posts stays in the posts table, so they
+        are still known as visited.
+        """
+        self.flush()
+        columns = ', '.join(ARCHIVE_COLUMNS)
+        with self.db_connection:
+            rows = self.db_connection.execute(
+                f'''SELECT {columns} FROM posts
+                WHERE date < ? AND date IS NOT NULL ORDER BY date''',
+                (str(before),)).fetchall()
+            if not rows:
+                return 0
+            data = {column: [str(value) if column == 'date' else value
+                             for value in values]
+                    for column, values in zip(ARCHIVE_COLUMNS, zip(*rows))}
+            chunk = zlib.compress(json.dumps(data).encode('utf-8'), 9)
+            self.db_connection.execute(
+                '''INSERT INTO archive(first_date, last_date, rows, data)
+                VALUES (?, ?, ?, ?)''',
+                (data['date'][0], data['date'][-1], len(rows), chunk))
+            self.db_connection.executemany(
+                '''UPDATE posts SET link = NULL, word = NULL, translation = NULL,
+                raw_result = NULL, date = NULL, subreddit = NULL, word_id = NULL
+                WHERE post_id = ?''', [(row[0],) for row in rows])
+        return len(rows)
+
+    def archived_posts(self):
+        """Yield the archived posts as dicts, oldest chunk first."""
+        chunks = self.db_connection.execute(
+            'SELECT data FROM archive ORDER BY id').fetchall()
+        for (chunk,) in chunks:
+            data = json.loads(zlib.decompress(chunk))
+            for values in zip(*(data[column] for column in ARCHIVE_COLUMNS)):
+                yield dict(zip(ARCHIVE_COLUMNS, values))
+
+    def stats(self, top=10):
+        """Most replied words, and posts and failures per subreddit."""
+        top_words = self.db_connection.execute(
+            '''SELECT word, posts FROM word_stats JOIN words ON words.id = word_id
+            ORDER BY posts DESC LIMIT ?''', (top,)).fetchall()
+        subreddits = self.db_connection.execute(
+            '''SELECT subreddit, posts, failures FROM subreddit_stats
+            ORDER BY subreddit''').fetchall()
+        failures = self.db_connection.execute(
+            '''SELECT subreddit, exception, failures FROM failure_stats
+            ORDER BY subreddit, exception''').fetchall()
+        return {'top_words': top_words, 'subreddits': subreddits,
+                'failures': failures}
+
+    def claim(self, post_id, date=None):
+        """Reserve post_id before replying to it.
+
+        Only one of the processes sharing the database gets the claim of a
+        post, so two bots never reply to the same post.
+        """
+        with self.db_connection:
+            cursor = self.db_connection.execute(
+                'INSERT OR IGNORE INTO claims(post_id, date) VALUES (?, ?)',
+                (post_id, date))
+        return cursor.rowcount == 1
+
+    def release(self, post_id):
+        """Give up the claim of a post that couldn't be replied."""
+        with self.db_connection:
+            self.db_connection.execute('DELETE FROM claims WHERE post_id = ?',
+                                       (post_id,))
+
+    def get_checkpoint(self, subreddit):
+        """Fullname of the last post processed on subreddit, if any."""
+        row = self.db_connection.execute(
+            'SELECT fullname FROM checkpoints WHERE subreddit = ?',
+            (subreddit,)).fetchone()
+        return row[0] if row else None
+
+    def set_checkpoint(self, subreddit, fullname, date):
+        with self.db_connection:
+            self.db_connection.execute(
+                'INSERT OR REPLACE INTO checkpoints(subreddit, fullname, date) '
+                'VALUES (?, ?, ?)', (subreddit, fullname, date))
+
+    def close(self):
+        self.flush()
+        self.db_connection.close()
@@ -0,0 +1,131 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class Clock(object):
+    """Fake clock, only moved by sleep or by setting now."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class Post(object):
+    """Reddit submission asking for word, or for its id if not given."""
+
+    def __init__(self, post_id, word=None):
+        self.id = post_id
+        self.fullname = f't3_{post_id}'
+        self.title = f'Wort of the hour: {word or post_id}'
+        self.url = f'https://redd.it/{post_id}'
+        self.replies = []
+
+    def reply(self, body):
+        self.replies.append(body)
+
+
+class Subreddit(object):
+    def __init__(self, posts):
+        self.posts = posts
+
+    def new(self, limit=None):
+        return iter(self.posts[:limit])
+
+
+class Auth(object):
+    limits = {}
+
+
+class Reddit(object):
+    """Reddit client with the given subreddits by name."""
+    auth = Auth()
+
+    def __init__(self, subreddits):
+        self.subreddits = subreddits
+
+    def subreddit(self, name):
+        return self.subreddits[name]
+
+
+class StubPonsServer(object):
+    """Local http server answering like the Pons dictionary api.
+
+    Words in `responses` are answered with their recorded response, other
+    words with 204. `failures[word]` is a list of statuses returned before
+    the real answer and `delay` is slept before answering every request.
+    """
+
+    def __init__(self, responses, delay=0):
+        self.responses = responses
+        self.delay = delay
+        self.failures = {}
+        self.requests = Counter()
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                word = parse_qs(urlparse(self.path).query)['q'][0]
+                with stub.lock:
+                    stub.requests[word] += 1
+                    failures = stub.failures.get(word)
+                    status = failures.pop(0) if failures else None
+                time.sleep(stub.delay)
+                if status is None:
+                    status = 200 if word in stub.responses else 204
+                body = b''
+                if status == 200:
+                    body = json.dumps([stub.responses[word]]).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/v1/dictionary'
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       kwargs={'poll_interval': 0.01},
+                                       daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def pons_responses():
+    with open(os.path.join(FIXTURES, 'pons_responses.json'), encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def pons_server(pons_responses):
+    server = StubPonsServer(pons_responses).start()
+    yield server
+    server.stop()
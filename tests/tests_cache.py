@@ -0,0 +1,58 @@
+import pytest
+
+from cache import LookupCache
+from conftest import Clock
+from exceptions import NoResultsError, TranslationException
+
+
+@pytest.fixture
+def clock():
+    return Clock(now=1000.0)
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return LookupCache(str(tmp_path / 'cache.db'), ttl=100, negative_ttl=10,
+                       memory_size=2, db_size=3, clock=clock)
+
+
+def test_hit_after_put_uses_normalized_word(cache):
+    cache.put('Hört', {'hits': []})
+    assert cache.get(' Hört ').result == {'hits': []}
+    assert cache.get('hört') is None
+    assert cache.get('Haus') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_entries_survive_restart(tmp_path, clock, cache):
+    cache.put('Dampf', {'hits': [1]})
+    reopened = LookupCache(str(tmp_path / 'cache.db'), clock=clock)
+    assert reopened.get('Dampf').result == {'hits': [1]}
+    assert reopened.db_hits == 1
+
+
+def test_entries_expire(cache, clock):
+    cache.put('Dampf', {'hits': [1]})
+    clock.now += 101
+    assert cache.get('Dampf') is None
+
+
+def test_negative_entries(cache, clock):
+    cache.put_error('Xyz', NoResultsError('No results'))
+    cache.put_error('Review', TranslationException('Translation'))
+    with pytest.raises(NoResultsError):
+        cache.get('Xyz').raise_error()
+    with pytest.raises(TranslationException):
+        cache.get('Review').raise_error()
+    clock.now += 11
+    assert cache.get('Xyz') is None
+
+
+def test_size_eviction(cache, clock):
+    for word in ['a', 'b', 'c', 'd']:
+        clock.now += 1
+        cache.put(word, {'word': word})
+    assert len(cache.memory) == 2
+    cache.memory.clear()
+    assert cache.get('a') is None
+    assert cache.get('d').result == {'word': 'd'}
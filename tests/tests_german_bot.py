@@ -1,3 +1,21 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import Post, Reddit, Subreddit
+from context import AppContext
+from exceptions import NoResultsError, TranslationException
+from pons import Pons
+from main import DeutscherBot
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+with open(os.path.join(FIXTURES, 'pons_responses.json'), encoding='utf-8') as f:
+    PONS_RESPONSES = json.load(f)
+
 
 # Sample words from /r/Sprache
 sample_words = ['Vermeidet', 'Western', 'Ordner', 'Konzil', 'Vorsichtig', 'Hört', 'Gewaltsam', 'Dampf', 'Sklave', 'Preis', 'Bibel', 'Review', 'Ein', 'Durcheinander', 'Bejahend', 'Ornament', 'Zügig', 'Gelb', 'Gefängnis', 'Orange', 'Zutiefst', 'Bronze', 'Hoffnung', 'Firma', 'Andacht', 'Reif', 'Verwandt', 'Zerstört', 'Speer', 'Nacht', 'Flamme', 'Kombination', 'Unterbrechung', 'Betont', 'Schlimm', 'Sicherheit', 'Vorsilbe', 'Reich', 'Sicher', 'Rückenseitig', 'Journal', 'Caritas', 'Geschenk', 'Verbringt', 'Vater', 'Symmetrisch', 'Unmut', 'Lösbar', 'Zügelt', 'Pfiffig']
@@ -7,30 +25,55 @@ sample_500 = ['öffentlich', 'Vermeidet', 'Western', 'Ordner', 'Konzil', 'Vorsic
 sample_800 = ['öffentlich', 'Vermeidet', 'Western', 'Ordner', 'Konzil', 'Vorsichtig', 'Hört', 'Gewaltsam', 'Dampf', 'Sklave', 'Preis', 'Bibel', 'Review', 'Ein', 'Durcheinander', 'Bejahend', 'Ornament', 'Zügig', 'Gelb', 'Gefängnis', 'Orange', 'Zutiefst', 'Bronze', 'Hoffnung', 'Firma', 'Andacht', 'Reif', 'Verwandt', 'Zerstört', 'Speer', 'Nacht', 'Flamme', 'Kombination', 'Unterbrechung', 'Betont', 'Schlimm', 'Sicherheit', 'Vorsilbe', 'Reich', 'Sicher', 'Rückenseitig', 'Journal', 'Caritas', 'Geschenk', 'Verbringt', 'Vater', 'Symmetrisch', 'Unmut', 'Lösbar', 'Zügelt', 'Pfiffig', 'Besitzt', 'Stift', 'Verbaut', 'Literarisch', 'Theorie', 'Abhilfe', 'Methode', 'Geschmack', 'Bündel', 'Schlacht', 'Nase', 'More', 'Sprungweite', 'Hube', 'Wachst', 'Treu', 'Ente', 'Sorglos', 'Darm', 'überredung/überredung', 'Periodisch', 'Geständnis', 'Nummer', 'Realität', 'Närrisch', 'An', 'Verdauung', 'Tiefe', 'Betrüger', 'Vertrag', 'Spekulation', 'Komparativ', 'Vollendeten', 'Tausend', 'Symmetrie', 'Kräftig', 'Angenehm', 'überwindet', 'Schlich', 'Appetit', 'Orchester', 'Rede', 'Debatte', 'Begeht', 'Real', 'Schwerkraft', 'Ungelenk', 'Duft', 'Irrtümlich', 'Straßengraben', 'Hilfsverb', 'Droben', 'Leicht', 'Geschickt', 'Abfolge', 'ähnelt', 'Kraftvoll', 'Wohlüberlegt', 'Geradheit', 'Bart', 'Wärme', 'Still', 'Region', 'Belegt', 'Mitte', 'Rille', 'Wappen', 'Flasche', 'Stattet', 'Kader', 'Name', 'Staub', 'Leiter', 'Gelegenheit', 'Seicht', 'Moralisch', 'Feindlich', 'Trügt', 'Koppelt', 'Geschicklichkeit', 'Zivil', 'Metallisch', 'Chemikalie', 'Klasse', 'Moment', 'Expandiert', 'Motor', 'Besiegung', 'Burg', 'Gehört', 'Leere', 'Baum', 'Versetzung', 'Fond', 'Scheibe', 'Blattwerk', 'Erfolg', 'Bund', 'Zimmer', 'Folter', 'Portion', 'Vorgesehen', 'Verstoß', 'Streng', 'Bleistift', 'Betrügt', 'Weiterhin', 'An', 'Wahr', 'Tool', 'Gold', 'Datum', 'Barsch', 'Multiplikation', 'Wiege', 'Zement', 'Misserfolg', 'Wunde', 'Vers', 'Fäulnis', 'Kabel', 'Verbal', 'Inhalt', 'Vertikal', 'Tropisch', 'Kandidatin', 'Kriminelle', 'Feierlich', 'Ausmaß', 'Energie', 'Schaden', 'Umher', 'Urkunde', 'Dach', 'Mahlzeit', 'Männchen', 'Schenkel', 'Entgelt', 'Schüssel', 'Auswertung', 'Defekt', 'Angemessen', 'Krankheit', 'Heck', 'Olive', 'Norden', 'Stuhl', 'Offen', 'Prozession', 'Kohlkopf', 'Freundlich', 'Loch', 'Begeisterung', 'Opponiert', 'Gefüge', 'Genug', 'Begierde', 'Verteidigt', 'Betrag', 'Schulter', 'Jahr', 'Wartezeit', 'Sand', 'Ritt', 'Mond', 'Hauptsächlich', 'Schicht', 'Segeltuch', 'Fähig', 'Gegenwert', 'Scham', 'Rezeption', 'Bohle', 'Winkel', 'umwerfend', 'Involviert', 'Petition', 'Muskulös', 'Medizin', 'Unwahrheit', 'Ständig', 'Geheimnis', 'Auswuchs', 'An', 'Erzählt', 'Weh', 'Adrett', 'Looping', 'Transport', 'Günstig', 'Freiheit', 'Day!', 'Anspruch', 'Erlaubt', 'Folgend', 'Irdisch', 'Himmlisch', 'Marinesoldat', 'Aufregung', 'Kantig', 'Einbuße', 'Narr', 'Glück', 'Drüse', 'Truhe', 'Militär', 'Bad', 'Messing', 'Belohnung', 'Glaube', 'Kasse', 'Zuverlässig', 'Handfläche', 'Spät', 'Cord', 'Andernfalls', 'Allgemein', 'Extensiv', 'Mangelhaft', 'Aufrecht', 'Diener', 'Bitte', 'Jagd', 'Mittelbar', 'Königreich', 'Fremd', 'Würde', 'Aufsicht', 'Inversion', 'Geruch', 'Nobel', 'Nackt', 'Großartig', 'Vision', 'Verkehr', 'Spezies', 'Belegten', 'Hin', 'Abwärts', 'Konfusion', 'Gewöhnlich', 'Papiertaschentuch', 'Polin', 'Weibchen', 'Ab', 'An', 'Rose', 'Krabbe', 'Konus', 'Erkältung', 'Kühn', 'Furunkel', 'Unterschieden', 'Gedanke', 'Auf', 'Entzückung', 'Gewiss', 'Denkt', 'Grat', 'Praktisch', 'Ruhm', 'Tanz', 'Chef', 'Legierung', 'Instrumental', 'Zurück', 'Thron', 'Stigma', 'Geschmack', 'Himmel', 'Kies', 'Vorrichtung', 'Jährlich', 'Wand', 'Saat', 'Nelke', 'Milch', 'Dame', 'Angst', 'Ruhe', 'Kahl', 'Teilweise', 'Unbedeutend', 'Identisch', 'Haushalt', 'Genugtuung', 'Fund', 'Helm', 'Fördert', 'Sukzessiv', 'Gärt', 'Kompakt', 'Vereint', 'Paste', 'Nasal', 'Pflege', 'Umfassung', 'Innere', 'Belehrt', 'Abschätzung', 'Würdig', 'Stall', 'Streng', 'Profit', 'Zu', 'Yard', 'Röhre', 'Ruin', 'Gerade', 'Unterbrechung', 'Schein', 'Eigenwillig', 'Sammelt', 'Student', 'Spezial', 'Intensiv', 'Jahrhundert', 'Süden', 'Sauber', 'Klinge', 'Apparatur', 'Gemeinschaft', 'Wehrt', 'Kaufmann', 'Häufig', 'Doktrin', 'Konstante', 'Versammlung', 'Wasser', 'Unter', 'Andauernd', 'äußerung/äußerung', 'Fertig', 'Fossil', 'Baumwolle', 'Fungiert', 'Ein', 'Schuss', 'Bauernhof', 'Bulle', 'Deprimierten', 'Meister', 'Ein', 'Elegant', 'Steif', 'Musik', 'Geld', 'Fest', 'Uhr', 'Alarm', 'Aufschrift', 'Direkt', 'Definitiv', 'Cover', 'Tugend', 'Gesellschaftlich', 'Abfall', 'Priester', 'Niedrig', 'Wald', 'Ganz', 'Vergrößert', 'Holz', 'Klug', 'Langsam', 'Pein', 'Konventionell', 'Wichtig', 'Verschieden', 'Gewohnheitsmäßig', 'Kontinuierlich', 'Anlehnung', 'Seltsam', 'Zweck', 'Ein', 'Ehemann', 'Sprecht', 'Intention', 'Arbeitsgang', 'Richterlich', 'Gesinnt', 'Anhänger', 'Gift', 'Gefahr', 'übermittelt', 'Bresche', 'Schiff', 'Sorte', 'Kiel', 'Umfrage', 'Blume', 'Kummer', 'College', 'Unkraut', 'Königin', 'Abweichung', 'Sahne', 'Kind', 'Ritter', 'Matt', 'Post', 'Katholik', 'Erkenntnis', 'Binse', 'Stoß', 'Falte', 'Wahl', 'Leicht', 'Finsternis', 'Gewölbe', 'Ungewiss', 'Schwierig', 'Reisebus', 'Assistent', 'Angelegenheit', 'Vehikel', 'Rest', 'Vor', 'Anwalt', 'Wahrheit', 'Fährte', 'Farbe', 'Dur', 'Ziegel', 'Konstituiert', 'Gewalt', 'Reise', 'Spirale', 'Signal', 'Glocke', 'Heilig', 'Verharrt', 'Lob', 'Zusammenhang', 'Maut', 'Zimmer', 'Nett', 'Hals', 'Verfahren', 'Maske', 'Fleisch', 'Kur', 'Tätlich', 'Zerstörung', 'Ein', 'Bürger', 'Glaubt', 'Versuch', 'Anatomie', 'Kühl', 'Stimmlich', 'Geschichte', 'Fleck', 'Klein', 'Getränk', 'Zusammen', 'Hahn', 'Gottheit', 'Scheinbar', 'Dekret', 'Käfer', 'Produktion', 'Bildlich', 'Galerie', 'Seele', 'Sitz', 'Nest', 'Nagel', 'Idee', 'Differenzial', 'Kalender', 'Einigkeit', 'Umriss', 'Atmet', 'Entscheid', 'Achse', 'Situation', 'Akut', 'Unterbreitung', 'Streit', 'Regelt', 'Erkennt', 'Flexibel', 'Fürsprecher', 'Resultat', 'Erwehrt', 'Phrase', 'Leute', 'Investiert', 'Affinität', 'Segel', 'Liebe', 'Dämpft', 'Politisch', 'Irritation', 'Konzern', 'Preis', 'Gruppe', 'Abflussrohr', 'Zweifel', 'Stärkt', 'Korrektur', 'Feder', 'Brisant', 'Geschwindigkeit', 'Intervall', 'Nennwert', 'Besetzung', 'Anschlag', 'Nadel', 'Gürtel', 'Konjunktion', 'Sauer', 'Sinn', 'Klub', 'Buch', 'Versprechen', 'Beliebt', 'Partiell', 'Obstruktion', 'Mineral', 'Display', 'Contest', 'Trost', 'Stamm', 'Abschüssig', 'Geschwindigkeit', 'Nerv', 'Schweregrad', 'Kommerz', 'Sträflich', 'Kaum', 'Beschäftigt', 'Atem', 'Kamm', 'Säure', 'Zählt', 'Verborgenheit', 'Vorrat', 'Flut', 'Fehler', 'Kruste', 'Kopf', 'Ab', 'Höflichkeit', 'Unfall', 'Leicht', 'Prinz', 'Rand', 'Pflicht', 'Staude', 'Antwort', 'Ungleich', 'Schlange', 'Tadellos', 'Elastisch', 'Ernstlich', 'Gläubig', 'Fehl', 'Leer', 'Zeuge', 'Kampf', 'Innig', 'Tempel', 'Verdrängt', 'Filet', 'Haft', 'Wort', 'Flur', 'Empfindung', 'Kopie', 'Extremität', 'Existenz', 'Mittellos', 'Wissenschaftlich', 'Steckbrief', 'Frachtgut', 'Netz', 'Sturm', 'Beweist', 'Aussprache', 'Falsch', 'Spritzt', 'Aussetzung', 'Genau', 'Ein', 'Repetition', 'Aussicht', 'Hell', 'Tier', 'Exekutiert', 'Kapitän', 'Rand', 'Gürtel', 'Primitiv', 'Produkt', 'Anbau', 'Vorsorge', 'Herausforderung', 'Ursprünglich', 'Expressiv', 'Korruption', 'Wartung', 'Blamage', 'Busch', 'Kirche', 'Auswahl', 'Vene', 'Stadt', 'Rechen', 'Verschwörung', 'Sichel', 'Heim', 'Haar', 'Ernte', 'Keil', 'Betrag', 'Gemüt', 'Um', 'Hinsicht', 'Vernachlässigung', 'Disput', 'Verquickt', 'Schnäppchen', 'Gegenteilig', 'Dampf', 'Königlich', 'Ruhe', 'Formation', 'Missstand', 'Etwa', 'Verlobung', 'Bestätigung', 'Material', 'Herrschaft', 'Glas', 'Ansehen', 'Perfektion', 'Brauch', 'Melodie', 'Spitze', 'Indirekt', 'Knochen', 'Neigung', 'Zusatz', 'Charme', 'Implementiert', 'Sofortig', 'Bild', 'Patient', 'Güteklasse', 'Kampf', 'Menschenmenge', 'Ursache', 'Agitation', 'Artikuliert', 'Beschäftigung', 'Elektrisch', 'Verkleinerungswort', 'Skelett', 'Gedächtnis', 'Flug', 'Erweitert', 'Gesichtspunkt', 'Beinahe', 'Kaiserlich', 'Famos', 'Verehrung', 'Oberfläche', 'Zuflucht', 'Fehler', 'Nutzen', 'Anlass', 'Weltraum', 'Moll', 'Auf', 'Maßgebend', 'Zu', 'Gesteht', 'Vortrefflichkeit', 'Gouverneur', 'Bezirk', 'Konträr', 'Vollständig', 'Reparatur', 'Brust', 'Lokomotive', 'Stille', 'ähnlichkeit/ähnlichkeit', 'Lösung', 'Fels', 'Linde', 'Prominent', 'Sprengstoff', 'Fest', 'Rücklage', 'Impuls', 'Stiefel', 'Vorurteil', 'Groß', 'Exakt', 'Platze', 'Eigentümlich', 'Innerparteilich', 'Beweis', 'Sammlung', 'Schubkraft', 'Schluss', 'Walze', 'Kontroverse', 'Schließt', 'Reich', 'Frage', 'Profi', 'Offensive', 'Projekt', 'Exponat', 'Ferse', 'Probe', 'Zehntel', 'Anteil', 'Model', 'Umgebt', 'Vergnügen', 'Aufrecht', 'Hübsch', 'Lieferung', 'Unterhaltung', 'Verachtung', 'Pfarrgemeinde', 'Affe', 'Minute', 'Krampf', 'Rudimentär', 'Tau', 'Fortgang', 'Arm', 'Seite', 'Ladung', 'Tor', 'Unheil', 'Doktor', 'Durchschnitt', 'Verfahrt', 'Zusage', 'Schreibt', 'Schlaf', 'Kette', 'Instruiert']
 sample_1000 = ['öffentlich', 'Vermeidet', 'Western', 'Ordner', 'Konzil', 'Vorsichtig', 'Hört', 'Gewaltsam', 'Dampf', 'Sklave', 'Preis', 'Bibel', 'Review', 'Ein', 'Durcheinander', 'Bejahend', 'Ornament', 'Zügig', 'Gelb', 'Gefängnis', 'Orange', 'Zutiefst', 'Bronze', 'Hoffnung', 'Firma', 'Andacht', 'Reif', 'Verwandt', 'Zerstört', 'Speer', 'Nacht', 'Flamme', 'Kombination', 'Unterbrechung', 'Betont', 'Schlimm', 'Sicherheit', 'Vorsilbe', 'Reich', 'Sicher', 'Rückenseitig', 'Journal', 'Caritas', 'Geschenk', 'Verbringt', 'Vater', 'Symmetrisch', 'Unmut', 'Lösbar', 'Zügelt', 'Pfiffig', 'Besitzt', 'Stift', 'Verbaut', 'Literarisch', 'Theorie', 'Abhilfe', 'Methode', 'Geschmack', 'Bündel', 'Schlacht', 'Nase', 'More', 'Sprungweite', 'Hube', 'Wachst', 'Treu', 'Ente', 'Sorglos', 'Darm', 'überredung/überredung', 'Periodisch', 'Geständnis', 'Nummer', 'Realität', 'Närrisch', 'An', 'Verdauung', 'Tiefe', 'Betrüger', 'Vertrag', 'Spekulation', 'Komparativ', 'Vollendeten', 'Tausend', 'Symmetrie', 'Kräftig', 'Angenehm', 'überwindet', 'Schlich', 'Appetit', 'Orchester', 'Rede', 'Debatte', 'Begeht', 'Real', 'Schwerkraft', 'Ungelenk', 'Duft', 'Irrtümlich', 'Straßengraben', 'Hilfsverb', 'Droben', 'Leicht', 'Geschickt', 'Abfolge', 'ähnelt', 'Kraftvoll', 'Wohlüberlegt', 'Geradheit', 'Bart', 'Wärme', 'Still', 'Region', 'Belegt', 'Mitte', 'Rille', 'Wappen', 'Flasche', 'Stattet', 'Kader', 'Name', 'Staub', 'Leiter', 'Gelegenheit', 'Seicht', 'Moralisch', 'Feindlich', 'Trügt', 'Koppelt', 'Geschicklichkeit', 'Zivil', 'Metallisch', 'Chemikalie', 'Klasse', 'Moment', 'Expandiert', 'Motor', 'Besiegung', 'Burg', 'Gehört', 'Leere', 'Baum', 'Versetzung', 'Fond', 'Scheibe', 'Blattwerk', 'Erfolg', 'Bund', 'Zimmer', 'Folter', 'Portion', 'Vorgesehen', 'Verstoß', 'Streng', 'Bleistift', 'Betrügt', 'Weiterhin', 'An', 'Wahr', 'Tool', 'Gold', 'Datum', 'Barsch', 'Multiplikation', 'Wiege', 'Zement', 'Misserfolg', 'Wunde', 'Vers', 'Fäulnis', 'Kabel', 'Verbal', 'Inhalt', 'Vertikal', 'Tropisch', 'Kandidatin', 'Kriminelle', 'Feierlich', 'Ausmaß', 'Energie', 'Schaden', 'Umher', 'Urkunde', 'Dach', 'Mahlzeit', 'Männchen', 'Schenkel', 'Entgelt', 'Schüssel', 'Auswertung', 'Defekt', 'Angemessen', 'Krankheit', 'Heck', 'Olive', 'Norden', 'Stuhl', 'Offen', 'Prozession', 'Kohlkopf', 'Freundlich', 'Loch', 'Begeisterung', 'Opponiert', 'Gefüge', 'Genug', 'Begierde', 'Verteidigt', 'Betrag', 'Schulter', 'Jahr', 'Wartezeit', 'Sand', 'Ritt', 'Mond', 'Hauptsächlich', 'Schicht', 'Segeltuch', 'Fähig', 'Gegenwert', 'Scham', 'Rezeption', 'Bohle', 'Winkel', 'umwerfend', 'Involviert', 'Petition', 'Muskulös', 'Medizin', 'Unwahrheit', 'Ständig', 'Geheimnis', 'Auswuchs', 'An', 'Erzählt', 'Weh', 'Adrett', 'Looping', 'Transport', 'Günstig', 'Freiheit', 'Day!', 'Anspruch', 'Erlaubt', 'Folgend', 'Irdisch', 'Himmlisch', 'Marinesoldat', 'Aufregung', 'Kantig', 'Einbuße', 'Narr', 'Glück', 'Drüse', 'Truhe', 'Militär', 'Bad', 'Messing', 'Belohnung', 'Glaube', 'Kasse', 'Zuverlässig', 'Handfläche', 'Spät', 'Cord', 'Andernfalls', 'Allgemein', 'Extensiv', 'Mangelhaft', 'Aufrecht', 'Diener', 'Bitte', 'Jagd', 'Mittelbar', 'Königreich', 'Fremd', 'Würde', 'Aufsicht', 'Inversion', 'Geruch', 'Nobel', 'Nackt', 'Großartig', 'Vision', 'Verkehr', 'Spezies', 'Belegten', 'Hin', 'Abwärts', 'Konfusion', 'Gewöhnlich', 'Papiertaschentuch', 'Polin', 'Weibchen', 'Ab', 'An', 'Rose', 'Krabbe', 'Konus', 'Erkältung', 'Kühn', 'Furunkel', 'Unterschieden', 'Gedanke', 'Auf', 'Entzückung', 'Gewiss', 'Denkt', 'Grat', 'Praktisch', 'Ruhm', 'Tanz', 'Chef', 'Legierung', 'Instrumental', 'Zurück', 'Thron', 'Stigma', 'Geschmack', 'Himmel', 'Kies', 'Vorrichtung', 'Jährlich', 'Wand', 'Saat', 'Nelke', 'Milch', 'Dame', 'Angst', 'Ruhe', 'Kahl', 'Teilweise', 'Unbedeutend', 'Identisch', 'Haushalt', 'Genugtuung', 'Fund', 'Helm', 'Fördert', 'Sukzessiv', 'Gärt', 'Kompakt', 'Vereint', 'Paste', 'Nasal', 'Pflege', 'Umfassung', 'Innere', 'Belehrt', 'Abschätzung', 'Würdig', 'Stall', 'Streng', 'Profit', 'Zu', 'Yard', 'Röhre', 'Ruin', 'Gerade', 'Unterbrechung', 'Schein', 'Eigenwillig', 'Sammelt', 'Student', 'Spezial', 'Intensiv', 'Jahrhundert', 'Süden', 'Sauber', 'Klinge', 'Apparatur', 'Gemeinschaft', 'Wehrt', 'Kaufmann', 'Häufig', 'Doktrin', 'Konstante', 'Versammlung', 'Wasser', 'Unter', 'Andauernd', 'äußerung/äußerung', 'Fertig', 'Fossil', 'Baumwolle', 'Fungiert', 'Ein', 'Schuss', 'Bauernhof', 'Bulle', 'Deprimierten', 'Meister', 'Ein', 'Elegant', 'Steif', 'Musik', 'Geld', 'Fest', 'Uhr', 'Alarm', 'Aufschrift', 'Direkt', 'Definitiv', 'Cover', 'Tugend', 'Gesellschaftlich', 'Abfall', 'Priester', 'Niedrig', 'Wald', 'Ganz', 'Vergrößert', 'Holz', 'Klug', 'Langsam', 'Pein', 'Konventionell', 'Wichtig', 'Verschieden', 'Gewohnheitsmäßig', 'Kontinuierlich', 'Anlehnung', 'Seltsam', 'Zweck', 'Ein', 'Ehemann', 'Sprecht', 'Intention', 'Arbeitsgang', 'Richterlich', 'Gesinnt', 'Anhänger', 'Gift', 'Gefahr', 'übermittelt', 'Bresche', 'Schiff', 'Sorte', 'Kiel', 'Umfrage', 'Blume', 'Kummer', 'College', 'Unkraut', 'Königin', 'Abweichung', 'Sahne', 'Kind', 'Ritter', 'Matt', 'Post', 'Katholik', 'Erkenntnis', 'Binse', 'Stoß', 'Falte', 'Wahl', 'Leicht', 'Finsternis', 'Gewölbe', 'Ungewiss', 'Schwierig', 'Reisebus', 'Assistent', 'Angelegenheit', 'Vehikel', 'Rest', 'Vor', 'Anwalt', 'Wahrheit', 'Fährte', 'Farbe', 'Dur', 'Ziegel', 'Konstituiert', 'Gewalt', 'Reise', 'Spirale', 'Signal', 'Glocke', 'Heilig', 'Verharrt', 'Lob', 'Zusammenhang', 'Maut', 'Zimmer', 'Nett', 'Hals', 'Verfahren', 'Maske', 'Fleisch', 'Kur', 'Tätlich', 'Zerstörung', 'Ein', 'Bürger', 'Glaubt', 'Versuch', 'Anatomie', 'Kühl', 'Stimmlich', 'Geschichte', 'Fleck', 'Klein', 'Getränk', 'Zusammen', 'Hahn', 'Gottheit', 'Scheinbar', 'Dekret', 'Käfer', 'Produktion', 'Bildlich', 'Galerie', 'Seele', 'Sitz', 'Nest', 'Nagel', 'Idee', 'Differenzial', 'Kalender', 'Einigkeit', 'Umriss', 'Atmet', 'Entscheid', 'Achse', 'Situation', 'Akut', 'Unterbreitung', 'Streit', 'Regelt', 'Erkennt', 'Flexibel', 'Fürsprecher', 'Resultat', 'Erwehrt', 'Phrase', 'Leute', 'Investiert', 'Affinität', 'Segel', 'Liebe', 'Dämpft', 'Politisch', 'Irritation', 'Konzern', 'Preis', 'Gruppe', 'Abflussrohr', 'Zweifel', 'Stärkt', 'Korrektur', 'Feder', 'Brisant', 'Geschwindigkeit', 'Intervall', 'Nennwert', 'Besetzung', 'Anschlag', 'Nadel', 'Gürtel', 'Konjunktion', 'Sauer', 'Sinn', 'Klub', 'Buch', 'Versprechen', 'Beliebt', 'Partiell', 'Obstruktion', 'Mineral', 'Display', 'Contest', 'Trost', 'Stamm', 'Abschüssig', 'Geschwindigkeit', 'Nerv', 'Schweregrad', 'Kommerz', 'Sträflich', 'Kaum', 'Beschäftigt', 'Atem', 'Kamm', 'Säure', 'Zählt', 'Verborgenheit', 'Vorrat', 'Flut', 'Fehler', 'Kruste', 'Kopf', 'Ab', 'Höflichkeit', 'Unfall', 'Leicht', 'Prinz', 'Rand', 'Pflicht', 'Staude', 'Antwort', 'Ungleich', 'Schlange', 'Tadellos', 'Elastisch', 'Ernstlich', 'Gläubig', 'Fehl', 'Leer', 'Zeuge', 'Kampf', 'Innig', 'Tempel', 'Verdrängt', 'Filet', 'Haft', 'Wort', 'Flur', 'Empfindung', 'Kopie', 'Extremität', 'Existenz', 'Mittellos', 'Wissenschaftlich', 'Steckbrief', 'Frachtgut', 'Netz', 'Sturm', 'Beweist', 'Aussprache', 'Falsch', 'Spritzt', 'Aussetzung', 'Genau', 'Ein', 'Repetition', 'Aussicht', 'Hell', 'Tier', 'Exekutiert', 'Kapitän', 'Rand', 'Gürtel', 'Primitiv', 'Produkt', 'Anbau', 'Vorsorge', 'Herausforderung', 'Ursprünglich', 'Expressiv', 'Korruption', 'Wartung', 'Blamage', 'Busch', 'Kirche', 'Auswahl', 'Vene', 'Stadt', 'Rechen', 'Verschwörung', 'Sichel', 'Heim', 'Haar', 'Ernte', 'Keil', 'Betrag', 'Gemüt', 'Um', 'Hinsicht', 'Vernachlässigung', 'Disput', 'Verquickt', 'Schnäppchen', 'Gegenteilig', 'Dampf', 'Königlich', 'Ruhe', 'Formation', 'Missstand', 'Etwa', 'Verlobung', 'Bestätigung', 'Material', 'Herrschaft', 'Glas', 'Ansehen', 'Perfektion', 'Brauch', 'Melodie', 'Spitze', 'Indirekt', 'Knochen', 'Neigung', 'Zusatz', 'Charme', 'Implementiert', 'Sofortig', 'Bild', 'Patient', 'Güteklasse', 'Kampf', 'Menschenmenge', 'Ursache', 'Agitation', 'Artikuliert', 'Beschäftigung', 'Elektrisch', 'Verkleinerungswort', 'Skelett', 'Gedächtnis', 'Flug', 'Erweitert', 'Gesichtspunkt', 'Beinahe', 'Kaiserlich', 'Famos', 'Verehrung', 'Oberfläche', 'Zuflucht', 'Fehler', 'Nutzen', 'Anlass', 'Weltraum', 'Moll', 'Auf', 'Maßgebend', 'Zu', 'Gesteht', 'Vortrefflichkeit', 'Gouverneur', 'Bezirk', 'Konträr', 'Vollständig', 'Reparatur', 'Brust', 'Lokomotive', 'Stille', 'ähnlichkeit/ähnlichkeit', 'Lösung', 'Fels', 'Linde', 'Prominent', 'Sprengstoff', 'Fest', 'Rücklage', 'Impuls', 'Stiefel', 'Vorurteil', 'Groß', 'Exakt', 'Platze', 'Eigentümlich', 'Innerparteilich', 'Beweis', 'Sammlung', 'Schubkraft', 'Schluss', 'Walze', 'Kontroverse', 'Schließt', 'Reich', 'Frage', 'Profi', 'Offensive', 'Projekt', 'Exponat', 'Ferse', 'Probe', 'Zehntel', 'Anteil', 'Model', 'Umgebt', 'Vergnügen', 'Aufrecht', 'Hübsch', 'Lieferung', 'Unterhaltung', 'Verachtung', 'Pfarrgemeinde', 'Affe', 'Minute', 'Krampf', 'Rudimentär', 'Tau', 'Fortgang', 'Arm', 'Seite', 'Ladung', 'Tor', 'Unheil', 'Doktor', 'Durchschnitt', 'Verfahrt', 'Zusage', 'Schreibt', 'Schlaf', 'Kette', 'Instruiert', 'Brustkorb', 'Rückerstattung', 'Vollendet', 'Akzeptanz', 'Niedrig', 'Bekannt', 'Schätzung', 'Hecke', 'Wahrnehmung', 'Gefährte', 'Empfängnis', 'Bei', 'Theke', 'Auflage', 'Dünnt', 'Seezunge', 'Hilfe', 'Blau', 'Bösartig', 'Bezeichnet', 'Uniform', 'Magen', 'Attitüde', 'Geschichte', 'Verzollt', 'Einzelhaft', 'Ventil', 'Riemen', 'Trennwand', 'Gewohnheit', 'Bewerbt', 'Freundschaft', 'Teilnahmslos', 'Druck', 'Beamter', 'Berg', 'Gleichheit', 'Inhalt', 'Hals', 'Garn', 'Entfaltet', 'Westen', 'Zug', 'Blick', 'Findet', 'Hauptsache', 'Befriedigt', 'Verwirrt', 'Lauf', 'Verzierung', 'Boom', 'Ausreichend', 'Vorliegen', 'Persönlich', 'Partikel', 'Befestigt', 'Höhe', 'Eingebung', 'Wild', 'Stern', 'Haut', 'Lord', 'Geschäft', 'Evolution', 'Struktur', 'Immunität', 'Gemeinsamkeit', 'Kommunion', 'Qualität', 'Verseht', 'Beispiel', 'Prüft', 'Schaltung', 'Zwischen', 'Titel', 'Nachahmung', 'Fußboden', 'Erregung', 'Elementar', 'Rundschreiben', 'Umfang', 'Ausblick', 'Osten', 'Stelle', 'Vorteil', 'Vorwahl', 'Meinung', 'Ab', 'Zucker', 'Sinn', 'Marsch', 'Obst', 'Operation', 'Fort', 'Fracht', 'Natur', 'Länge', 'Mäßig', 'Kirsche', 'Anreiz', 'Entschlossenheit', 'Sofort', 'Sorte', 'Verdruss', 'Gefühl', 'Mode', 'Ausruf', 'Trennt', 'Fundus', 'Verkleidung', 'Illustration', 'Schutz', 'Ausstellung', 'Fahl', 'Scheitert', 'Zeugenaussage', 'Wohnsitz', 'Bewegung', 'Quittiert', 'Tendiert', 'Führung', 'Spendiert', 'Schnell', 'Metall', 'Flotte', 'Wolke', 'Blut', 'Künstlich', 'Extern', 'Zeremonie', 'Abgeordnetenhaus', 'Henkel', 'Formell', 'Gläsern', 'Abstimmung', 'Klausur', 'Boden', 'Einführung', 'Gewinn', 'Füllt', 'Qual', 'Konsonant', 'Horizont', 'Englisch', 'Trick', 'Runge', 'Form', 'Beweis', 'Zucht', 'Aufeinanderfolgend', 'Dokument', 'Aus', 'Vordergründig', 'Ware', 'Lest', 'Fisch', 'Ungleich', 'Attribut', 'Abkommen', 'Land', 'Gewinn', 'Stück', 'Limes', 'Humor', 'Mantel', 'Effekt', 'Bischof', 'Prim', 'Berg', 'Maschinerie', 'Adjektiv', 'Frühling', 'Stürmer', 'Ersatz', 'Ebene', 'Party', 'Locker', 'Blitz', 'Exekution', 'Singular', 'Vernünftig', 'Genüge', 'Erweist', 'Unschlüssig', 'Experiment', 'Folgt', 'Spalte', 'Kaputt', 'Entsorgt', 'Notwendigkeit', 'Anpassung', 'Berichtigt', 'Kapsel', 'Zertretet', 'Front', 'Charakter', 'Vorläufig', 'Konserve', 'Organisation', 'Gegenteil']
 
-def test_lookup_word():
-    pass
+@pytest.fixture
+def bot(tmp_path, monkeypatch):
+    monkeypatch.setattr(Pons, '_search', lambda self, word: PONS_RESPONSES[word])
+    context = AppContext(db_path=str(tmp_path), pons_key='secret')
+    yield DeutscherBot('Sprache', context=context)
+    context.close()
 
 
-"""
-dbot = DeutscherBot()
+def test_import_has_no_side_effects():
+    # praw and requests are only imported once reddit or pons are used.
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c',
+                    "import sys, main; "
+                    "assert 'praw' not in sys.modules; "
+                    "assert 'requests' not in sys.modules"],
+                   cwd=root, check=True)
+    context = AppContext(db_path='/nonexistent')
+    DeutscherBot(context=context)
+    assert context.resources == {}
 
 
-words3 = sample_200 = ['Vermeidet', 'Western', 'Ordner', 'Konzil', 'Vorsichtig', 'Hört', 'Gewaltsam', 'Dampf', 'Sklave', 'Preis', 'Bibel', 'Review', 'Ein', 'Durcheinander', 'Bejahend', 'Ornament', 'Zügig', 'Gelb', 'Gefängnis', 'Orange', 'Zutiefst', 'Bronze', 'Hoffnung', 'Firma', 'Andacht', 'Reif', 'Verwandt', 'Zerstört', 'Speer', 'Nacht', 'Flamme', 'Kombination', 'Unterbrechung', 'Betont', 'Schlimm', 'Sicherheit', 'Vorsilbe', 'Reich', 'Sicher', 'Rückenseitig', 'Journal', 'Caritas', 'Geschenk', 'Verbringt', 'Vater', 'Symmetrisch', 'Unmut', 'Lösbar', 'Zügelt', 'Pfiffig', 'Besitzt', 'Stift', 'Verbaut', 'Literarisch', 'Theorie', 'Abhilfe', 'Methode', 'Geschmack', 'Bündel', 'Schlacht', 'Nase', 'More', 'Sprungweite', 'Hube', 'Wachst', 'Treu', 'Ente', 'Sorglos', 'Darm', 'überredung/überredung', 'Periodisch', 'Geständnis', 'Nummer', 'Realität', 'Närrisch', 'An', 'Verdauung', 'Tiefe', 'Betrüger', 'Vertrag', 'Spekulation', 'Komparativ', 'Vollendeten', 'Tausend', 'Symmetrie', 'Kräftig', 'Angenehm', 'überwindet', 'Schlich', 'Appetit', 'Orchester', 'Rede', 'Debatte', 'Begeht', 'Real', 'Schwerkraft', 'Ungelenk', 'Duft', 'Irrtümlich', 'Straßengraben', 'Hilfsverb', 'Droben', 'Leicht', 'Geschickt', 'Abfolge', 'ähnelt', 'Kraftvoll', 'Wohlüberlegt', 'Geradheit', 'Bart', 'Wärme', 'Still', 'Region', 'Belegt', 'Mitte', 'Rille', 'Wappen', 'Flasche', 'Stattet', 'Kader', 'Name', 'Staub', 'Leiter', 'Gelegenheit', 'Seicht', 'Moralisch', 'Feindlich', 'Trügt', 'Koppelt', 'Geschicklichkeit', 'Zivil', 'Metallisch', 'Chemikalie', 'Klasse', 'Moment', 'Expandiert', 'Motor', 'Besiegung', 'Burg', 'Gehört', 'Leere', 'Baum', 'Versetzung', 'Fond', 'Scheibe', 'Blattwerk', 'Erfolg', 'Bund', 'Zimmer', 'Folter', 'Portion', 'Vorgesehen', 'Verstoß', 'Streng', 'Bleistift', 'Betrügt', 'Weiterhin', 'An', 'Wahr', 'Tool', 'Gold', 'Datum', 'Barsch', 'Multiplikation', 'Wiege', 'Zement', 'Misserfolg', 'Wunde', 'Vers', 'Fäulnis', 'Kabel', 'Verbal', 'Inhalt', 'Vertikal', 'Tropisch', 'Kandidatin', 'Kriminelle', 'Feierlich', 'Ausmaß', 'Energie', 'Schaden', 'Umher', 'Urkunde', 'Dach', 'Mahlzeit', 'Männchen', 'Schenkel', 'Entgelt', 'Schüssel', 'Auswertung', 'Defekt', 'Angemessen', 'Krankheit', 'Heck', 'Olive', 'Norden', 'Stuhl', 'Offen', 'Prozession', 'Kohlkopf']
-sample_500 = ['öffentlich', 'Vermeidet', 'Western', 'Ordner', 'Konzil', 'Vorsichtig', 'Hört', 'Gewaltsam', 'Dampf', 'Sklave', 'Preis', 'Bibel', 'Review', 'Ein', 'Durcheinander', 'Bejahend', 'Ornament', 'Zügig', 'Gelb', 'Gefängnis', 'Orange', 'Zutiefst', 'Bronze', 'Hoffnung', 'Firma', 'Andacht', 'Reif', 'Verwandt', 'Zerstört', 'Speer', 'Nacht', 'Flamme', 'Kombination', 'Unterbrechung', 'Betont', 'Schlimm', 'Sicherheit', 'Vorsilbe', 'Reich', 'Sicher', 'Rückenseitig', 'Journal', 'Caritas', 'Geschenk', 'Verbringt', 'Vater', 'Symmetrisch', 'Unmut', 'Lösbar', 'Zügelt', 'Pfiffig', 'Besitzt', 'Stift', 'Verbaut', 'Literarisch', 'Theorie', 'Abhilfe', 'Methode', 'Geschmack', 'Bündel', 'Schlacht', 'Nase', 'More', 'Sprungweite', 'Hube', 'Wachst', 'Treu', 'Ente', 'Sorglos', 'Darm', 'überredung/überredung', 'Periodisch', 'Geständnis', 'Nummer', 'Realität', 'Närrisch', 'An', 'Verdauung', 'Tiefe', 'Betrüger', 'Vertrag', 'Spekulation', 'Komparativ', 'Vollendeten', 'Tausend', 'Symmetrie', 'Kräftig', 'Angenehm', 'überwindet', 'Schlich', 'Appetit', 'Orchester', 'Rede', 'Debatte', 'Begeht', 'Real', 'Schwerkraft', 'Ungelenk', 'Duft', 'Irrtümlich', 'Straßengraben', 'Hilfsverb', 'Droben', 'Leicht', 'Geschickt', 'Abfolge', 'ähnelt', 'Kraftvoll', 'Wohlüberlegt', 'Geradheit', 'Bart', 'Wärme', 'Still', 'Region', 'Belegt', 'Mitte', 'Rille', 'Wappen', 'Flasche', 'Stattet', 'Kader', 'Name', 'Staub', 'Leiter', 'Gelegenheit', 'Seicht', 'Moralisch', 'Feindlich', 'Trügt', 'Koppelt', 'Geschicklichkeit', 'Zivil', 'Metallisch', 'Chemikalie', 'Klasse', 'Moment', 'Expandiert', 'Motor', 'Besiegung', 'Burg', 'Gehört', 'Leere', 'Baum', 'Versetzung', 'Fond', 'Scheibe', 'Blattwerk', 'Erfolg', 'Bund', 'Zimmer', 'Folter', 'Portion', 'Vorgesehen', 'Verstoß', 'Streng', 'Bleistift', 'Betrügt', 'Weiterhin', 'An', 'Wahr', 'Tool', 'Gold', 'Datum', 'Barsch', 'Multiplikation', 'Wiege', 'Zement', 'Misserfolg', 'Wunde', 'Vers', 'Fäulnis', 'Kabel', 'Verbal', 'Inhalt', 'Vertikal', 'Tropisch', 'Kandidatin', 'Kriminelle', 'Feierlich', 'Ausmaß', 'Energie', 'Schaden', 'Umher', 'Urkunde', 'Dach', 'Mahlzeit', 'Männchen', 'Schenkel', 'Entgelt', 'Schüssel', 'Auswertung', 'Defekt', 'Angemessen', 'Krankheit', 'Heck', 'Olive', 'Norden', 'Stuhl', 'Offen', 'Prozession', 'Kohlkopf', 'Freundlich', 'Loch', 'Begeisterung', 'Opponiert', 'Gefüge', 'Genug', 'Begierde', 'Verteidigt', 'Betrag', 'Schulter', 'Jahr', 'Wartezeit', 'Sand', 'Ritt', 'Mond', 'Hauptsächlich', 'Schicht', 'Segeltuch', 'Fähig', 'Gegenwert', 'Scham', 'Rezeption', 'Bohle', 'Winkel', 'umwerfend', 'Involviert', 'Petition', 'Muskulös', 'Medizin', 'Unwahrheit', 'Ständig', 'Geheimnis', 'Auswuchs', 'An', 'Erzählt', 'Weh', 'Adrett', 'Looping', 'Transport', 'Günstig', 'Freiheit', 'Day!', 'Anspruch', 'Erlaubt', 'Folgend', 'Irdisch', 'Himmlisch', 'Marinesoldat', 'Aufregung', 'Kantig', 'Einbuße', 'Narr', 'Glück', 'Drüse', 'Truhe', 'Militär', 'Bad', 'Messing', 'Belohnung', 'Glaube', 'Kasse', 'Zuverlässig', 'Handfläche', 'Spät', 'Cord', 'Andernfalls', 'Allgemein', 'Extensiv', 'Mangelhaft', 'Aufrecht', 'Diener', 'Bitte', 'Jagd', 'Mittelbar', 'Königreich', 'Fremd', 'Würde', 'Aufsicht', 'Inversion', 'Geruch', 'Nobel', 'Nackt', 'Großartig', 'Vision', 'Verkehr', 'Spezies', 'Belegten', 'Hin', 'Abwärts', 'Konfusion', 'Gewöhnlich', 'Papiertaschentuch', 'Polin', 'Weibchen', 'Ab', 'An', 'Rose', 'Krabbe', 'Konus', 'Erkältung', 'Kühn', 'Furunkel', 'Unterschieden', 'Gedanke', 'Auf', 'Entzückung', 'Gewiss', 'Denkt', 'Grat', 'Praktisch', 'Ruhm', 'Tanz', 'Chef', 'Legierung', 'Instrumental', 'Zurück', 'Thron', 'Stigma', 'Geschmack', 'Himmel', 'Kies', 'Vorrichtung', 'Jährlich', 'Wand', 'Saat', 'Nelke', 'Milch', 'Dame', 'Angst', 'Ruhe', 'Kahl', 'Teilweise', 'Unbedeutend', 'Identisch', 'Haushalt', 'Genugtuung', 'Fund', 'Helm', 'Fördert', 'Sukzessiv', 'Gärt', 'Kompakt', 'Vereint', 'Paste', 'Nasal', 'Pflege', 'Umfassung', 'Innere', 'Belehrt', 'Abschätzung', 'Würdig', 'Stall', 'Streng', 'Profit', 'Zu', 'Yard', 'Röhre', 'Ruin', 'Gerade', 'Unterbrechung', 'Schein', 'Eigenwillig', 'Sammelt', 'Student', 'Spezial', 'Intensiv', 'Jahrhundert', 'Süden', 'Sauber', 'Klinge', 'Apparatur', 'Gemeinschaft', 'Wehrt', 'Kaufmann', 'Häufig', 'Doktrin', 'Konstante', 'Versammlung', 'Wasser', 'Unter', 'Andauernd', 'äußerung/äußerung', 'Fertig', 'Fossil', 'Baumwolle', 'Fungiert', 'Ein', 'Schuss', 'Bauernhof', 'Bulle', 'Deprimierten', 'Meister', 'Ein', 'Elegant', 'Steif', 'Musik', 'Geld', 'Fest', 'Uhr', 'Alarm', 'Aufschrift', 'Direkt', 'Definitiv', 'Cover', 'Tugend', 'Gesellschaftlich', 'Abfall', 'Priester', 'Niedrig', 'Wald', 'Ganz', 'Vergrößert', 'Holz', 'Klug', 'Langsam', 'Pein', 'Konventionell', 'Wichtig', 'Verschieden', 'Gewohnheitsmäßig', 'Kontinuierlich', 'Anlehnung', 'Seltsam', 'Zweck', 'Ein', 'Ehemann', 'Sprecht', 'Intention', 'Arbeitsgang', 'Richterlich', 'Gesinnt', 'Anhänger', 'Gift', 'Gefahr', 'übermittelt', 'Bresche', 'Schiff', 'Sorte', 'Kiel', 'Umfrage', 'Blume', 'Kummer', 'College', 'Unkraut', 'Königin', 'Abweichung', 'Sahne', 'Kind', 'Ritter', 'Matt', 'Post', 'Katholik', 'Erkenntnis', 'Binse', 'Stoß', 'Falte', 'Wahl', 'Leicht', 'Finsternis', 'Gewölbe', 'Ungewiss', 'Schwierig', 'Reisebus', 'Assistent', 'Angelegenheit', 'Vehikel', 'Rest', 'Vor', 'Anwalt', 'Wahrheit', 'Fährte', 'Farbe', 'Dur', 'Ziegel', 'Konstituiert', 'Gewalt', 'Reise', 'Spirale', 'Signal', 'Glocke', 'Heilig', 'Verharrt', 'Lob', 'Zusammenhang', 'Maut', 'Zimmer', 'Nett', 'Hals', 'Verfahren', 'Maske', 'Fleisch', 'Kur', 'Tätlich', 'Zerstörung', 'Ein', 'Bürger', 'Glaubt', 'Versuch', 'Anatomie']
-print(f"words to search {len(sample_500)}")
-for i, word in enumerate(sample_500):
-    print(i)
-    try:
-        result = dbot.search_word(word)
-    except NotImplementedError:
-        print("Translation error")
-        print(word)
-        continue
-    except DeutscherBotException:
-        print(f"Exception for word {word}")
-        continue
-
-    definition = dbot.prepare_comment(result)
-    print(definition)
-    #  post.reply(definition)
-"""
\ No newline at end of file
+def test_lookup_word(bot):
+    word_details = bot.search_word('Dampf')
+    assert word_details['translation'] == 'steam (*no pl*)'
+    comment = bot.prepare_comment(word_details)
+    assert comment.startswith('**der Dampf** [dampf] | *Noun*')
+    assert 'reddit' not in bot.context.resources
+
+
+def test_translations_are_cached_as_errors(bot):
+    with pytest.raises(TranslationException):
+        bot.search_word('Review')
+    assert bot.pons.cache.get('Review').is_negative
+
+
+def test_failed_lookups_are_counted_once(tmp_path, monkeypatch):
+    def search(self, word):
+        if word not in PONS_RESPONSES:
+            raise NoResultsError('No results')
+        return PONS_RESPONSES[word]
+
+    monkeypatch.setattr(Pons, '_search', search)
+    posts = [Post('a', 'Review'), Post('b', 'Xyz')]
+    reddit = Reddit({'Sprache': Subreddit(posts)})
+    with AppContext(db_path=str(tmp_path), pons_key='secret',
+                    reddit=reddit) as context:
+        bot = DeutscherBot('Sprache', context=context)
+        for _ in range(3):
+            bot.scan_posts(cant=2)
+        assert context.store.stats()['failures'] == [
+            ('Sprache', 'NoResultsError', 1), ('Sprache', 'TranslationException', 1)]
+    assert not posts[0].replies and not posts[1].replies
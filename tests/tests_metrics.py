@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from exceptions import SearchError
+from metrics import Metrics
+
+
+def test_timer_records_latency_and_errors():
+    metrics = Metrics()
+
+    @metrics.timed('pons_search')
+    def search(word):
+        if word == 'Xyz':
+            raise SearchError(word)
+        return word
+
+    assert search('Dampf') == 'Dampf'
+    with pytest.raises(SearchError):
+        search('Xyz')
+    metrics.gauge('lookup_cache_hit_ratio', lambda: 0.5)
+
+    data = json.loads(metrics.to_json())
+    histogram = data['latency_seconds']['pons_search']
+    assert histogram['count'] == 2
+    assert histogram['buckets']['+Inf'] == 2
+    assert data['counters'] == [{'name': 'errors', 'value': 1,
+                                 'stage': 'pons_search',
+                                 'exception': 'SearchError'}]
+    assert data['gauges'] == {'lookup_cache_hit_ratio': 0.5}
+
+
+def test_prometheus_export():
+    metrics = Metrics()
+    metrics.observe('reply', 0.3)
+    metrics.inc('errors', stage='reply', exception='APIException')
+    text = metrics.to_prometheus()
+    assert 'deutscherbot_stage_latency_seconds_bucket{stage="reply",le="0.25"} 0' in text
+    assert 'deutscherbot_stage_latency_seconds_bucket{stage="reply",le="0.5"} 1' in text
+    assert 'deutscherbot_stage_latency_seconds_count{stage="reply"} 1' in text
+    assert ('deutscherbot_errors_total{exception="APIException",stage="reply"} 1'
+            in text)
+
+
+def test_drain_and_merge():
+    worker, metrics = Metrics(), Metrics()
+    worker.observe('pons_search', 0.3)
+    worker.inc('errors', stage='pons_search', exception='SearchError')
+    metrics.observe('pons_search', 0.02)
+
+    metrics.merge(worker.drain())
+
+    assert not worker.histograms and not worker.counters
+    histogram = metrics.to_dict()['latency_seconds']['pons_search']
+    assert histogram['count'] == 2
+    assert histogram['sum'] == pytest.approx(0.32)
+    assert metrics.value('errors', stage='pons_search',
+                         exception='SearchError') == 1
@@ -0,0 +1,37 @@
+import json
+import os
+
+import pytest
+
+import parsing
+from exceptions import TranslationException
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+with open(os.path.join(FIXTURES, 'pons_responses.json'), encoding='utf-8') as f:
+    RESPONSES = json.load(f)
+
+
+def test_parse_noun_with_example():
+    assert parsing.parse_hit(RESPONSES['Dampf']['hits'][0]) == {
+        'word': 'Dampf',
+        'word_type': 'noun',
+        'metadata': {'flexion': '<-[e]s, Dämpfe>', 'phonetics': '[dampf]',
+                     'wordclass': 'SUBST', 'genus': 'm'},
+        'gender': 'm',
+        'translation': 'steam (*no pl*)',
+        'example': ('(*Dampf*)(*ablassen*)', 'to let off steam'),
+    }
+
+
+def test_parse_verb_without_example():
+    result = parsing.parse_hit(RESPONSES['gehören']['hits'][0])
+    assert result['word'] == 'gehören'
+    assert result['translation'] == 'to belong to (*sb*)'
+    assert result['metadata']['verbclass'] == 'intr'
+    assert 'gender' not in result and 'example' not in result
+
+
+def test_translations_are_not_supported():
+    with pytest.raises(TranslationException):
+        parsing.parse_hit(RESPONSES['Review']['hits'][0])
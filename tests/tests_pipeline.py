@@ -0,0 +1,72 @@
+import threading
+
+from conftest import Clock, Post
+from exceptions import SearchError
+from pipeline import ScanPipeline, TokenBucket
+
+
+def test_token_bucket_paces_actions():
+    clock = Clock()
+    bucket = TokenBucket(rate=0.5, capacity=1, clock=clock, sleep=clock.sleep,
+                         wall_clock=clock)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.slept == [2.0, 2.0]
+
+
+def test_token_bucket_honours_reddit_limits():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, capacity=5, clock=clock, sleep=clock.sleep,
+                         wall_clock=clock)
+    bucket.update_from_limits({'remaining': 50, 'reset_timestamp': 60})
+    bucket.acquire()
+    bucket.update_from_limits({'remaining': 0, 'reset_timestamp': 60})
+    bucket.acquire()
+    assert clock.slept == [60]
+
+
+def test_pipeline_looks_up_concurrently_and_replies_in_order():
+    posts = [Post(str(i)) for i in range(6)]
+    barrier = threading.Barrier(3, timeout=5)
+    replies = []
+
+    def lookup(post):
+        if post.title.endswith(('0', '1', '2')):
+            barrier.wait()
+        if post.title.endswith('4'):
+            raise SearchError('Not found')
+        return post.title.upper()
+
+    def reply(post, result):
+        replies.append(result)
+
+    clock = Clock()
+    limiter = TokenBucket(rate=1, clock=clock, sleep=clock.sleep,
+                          wall_clock=clock)
+    replied = ScanPipeline(lookup, reply, limiter, workers=3).run(posts)
+    assert replies == [p.title.upper() for p in posts if not p.title.endswith('4')]
+    assert len(replied) == 5
+
+
+def test_pipeline_skips_posts_with_unexpected_errors():
+    posts = [Post('a', 'Dampf'), Post('b', 'Preis')]
+    errors, replies = [], []
+
+    def lookup(post):
+        if post.title.endswith('Dampf'):
+            raise KeyError('genus')
+        return post.title
+
+    def on_error(post, exception):
+        errors.append((post, exception))
+
+    def reply(post, result):
+        replies.append(result)
+
+    clock = Clock()
+    limiter = TokenBucket(rate=1, clock=clock, sleep=clock.sleep,
+                          wall_clock=clock)
+    replied = ScanPipeline(lookup, reply, limiter, on_error=on_error).run(posts)
+    assert replied == [posts[1]]
+    assert replies == ['Wort of the hour: Preis']
+    assert [(post, type(e)) for post, e in errors] == [(posts[0], KeyError)]
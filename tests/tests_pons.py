@@ -0,0 +1,63 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cache import LookupCache
+from exceptions import NoResultsError, SearchError
+from async_pons import AsyncPons
+from pons import Pons
+
+
+@pytest.fixture
+def pons(pons_server):
+    client = Pons(key='secret', base_url=pons_server.url, backoff_factor=0)
+    yield client
+    client.close()
+
+
+def test_search(pons, pons_responses):
+    assert pons.search('Dampf') == pons_responses['Dampf']
+    with pytest.raises(NoResultsError):
+        pons.search('Xyz')
+
+
+def test_retries_server_errors(pons, pons_server, pons_responses):
+    pons_server.failures['Dampf'] = [503, 429]
+    assert pons.search('Dampf') == pons_responses['Dampf']
+    assert pons_server.requests['Dampf'] == 3
+
+    pons_server.failures['Dampf'] = [500] * 4
+    with pytest.raises(SearchError):
+        pons.search('Dampf')
+
+
+def test_connection_errors_are_search_errors():
+    pons = Pons(key='secret', base_url='http://127.0.0.1:9/', retries=0)
+    with pytest.raises(SearchError):
+        pons.search('Dampf')
+
+
+def test_concurrent_searches_share_a_request(pons, pons_server, pons_responses):
+    pons_server.delay = 0.2
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(pons.search, ['Dampf', ' Dampf', 'Dampf', 'Dampf']))
+    assert results == [pons_responses['Dampf']] * 4
+    assert pons_server.requests['Dampf'] == 1
+
+
+def test_async_front_end(pons, pons_server, pons_responses, tmp_path):
+    pons.cache = LookupCache(str(tmp_path / 'cache.db'))
+    pons_server.delay = 0.1
+    async_pons = AsyncPons(pons)
+
+    async def search_all():
+        return await asyncio.gather(*[async_pons.search(word) for word in
+                                      ['Dampf', 'Dampf', 'gehören']])
+
+    results = asyncio.run(search_all())
+    assert results == [pons_responses['Dampf'], pons_responses['Dampf'],
+                       pons_responses['gehören']]
+    assert pons_server.requests['Dampf'] == 1
+    assert asyncio.run(async_pons.search('Dampf')) == pons_responses['Dampf']
+    assert pons_server.requests['Dampf'] == 1
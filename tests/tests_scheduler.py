@@ -0,0 +1,85 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import Post, Reddit, Subreddit
+from context import AppContext
+from exceptions import DeutscherBotException
+from main import DeutscherBot
+from metrics import REGISTRY
+from scheduler import Scheduler, interleave
+from wordindex import WordIndex
+
+
+def test_interleave():
+    assert interleave([[1, 2, 3], [4], [5, 6]]) == [1, 4, 5, 2, 6, 3]
+
+
+def test_round_looks_up_shared_words_once(tmp_path):
+    sprache = [Post('a1', 'Dampf'), Post('a2', 'Xyz')]
+    german = [Post('b1', 'Dampf '), Post('b2', 'Preis')]
+    context = AppContext(db_path=str(tmp_path),
+                         reddit=Reddit({'Sprache': Subreddit(sprache),
+                                        'German': Subreddit(german)}))
+    context.store.add_post('b2', '', 'Preis', '', '', '', 'German')
+    looked_up = []
+
+    def lookup(word):
+        looked_up.append(word)
+        if word == 'Xyz':
+            return None, DeutscherBotException('No results'), None
+        return ({'word': word, 'translation': 'steam'}, f'**{word}**'), None, None
+
+    bots = [DeutscherBot(name, context=context) for name in ('Sprache', 'German')]
+    scheduler = Scheduler(bots, replies_per_minute=6000, lookup=lookup,
+                          stop_event=threading.Event())
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        scheduler.run_round(pool)
+
+    assert sorted(looked_up) == ['Dampf', 'Xyz']
+    assert sprache[0].replies == german[0].replies == ['**Dampf**']
+    assert not sprache[1].replies and not german[1].replies
+    assert context.store.new_post_ids(['a1', 'b1', 'a2']) == ['a2']
+    # Another process already claimed the posts it replied to.
+    assert not context.store.claim('a1')
+    context.close()
+
+
+def test_round_backs_off_on_unexpected_errors(tmp_path):
+    posts = [Post('a1', 'Dampf')]
+    context = AppContext(db_path=str(tmp_path),
+                         reddit=Reddit({'Sprache': Subreddit(posts)}))
+
+    def lookup(word):
+        return None, KeyError('hits'), None
+
+    bot = DeutscherBot('Sprache', context=context)
+    scheduler = Scheduler([bot], replies_per_minute=6000, lookup=lookup)
+    scheduler.new_pool = lambda: ThreadPoolExecutor(max_workers=1)
+    scheduler.run(once=True)
+
+    assert scheduler.backoff.failures == 1
+    assert not posts[0].replies
+    # Retried in the next round.
+    assert context.store.new_post_ids(['a1']) == ['a1']
+    context.close()
+
+
+def test_run_looks_up_words_on_worker_processes(tmp_path):
+    index = WordIndex(str(tmp_path / 'words.db'))
+    index.add('Dampf', {'word': 'der Dampf', 'translation': 'steam'},
+              '**der Dampf**')
+    index.close()
+    sprache, german = [Post('a1', 'Dampf')], [Post('b1', 'Dampf')]
+    context = AppContext(db_path=str(tmp_path),
+                         reddit=Reddit({'Sprache': Subreddit(sprache),
+                                        'German': Subreddit(german)}))
+    REGISTRY.reset()
+
+    bots = [DeutscherBot(name, context=context) for name in ('Sprache', 'German')]
+    Scheduler(bots, processes=2, replies_per_minute=6000).run(once=True)
+
+    assert sprache[0].replies == german[0].replies == ['**der Dampf**']
+    # Metrics recorded by the workers are merged into the registry, once.
+    assert REGISTRY.value('word_index_hits') == 1
+    assert REGISTRY.histograms['reddit_listing'].count == 2
+    context.close()
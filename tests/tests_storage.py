@@ -0,0 +1,120 @@
+import sqlite3
+
+from exceptions import DeutscherBotException, SearchError, TranslationException
+from storage import MIGRATIONS, PostStore
+
+
+def make_row(post_id):
+    return (post_id, f'https://redd.it/{post_id}', 'Dampf', 'steam', '{}',
+            '2018-02-03 13:00:28', 'Sprache')
+
+
+def test_migrates_legacy_table_with_duplicates(tmp_path):
+    path = str(tmp_path / 'posts.db')
+    connection = sqlite3.connect(path)
+    connection.execute('''CREATE TABLE posts(
+        post_id, link, word, translation, raw_result, date, subreddit)''')
+    connection.executemany('INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)',
+                           [make_row('a'), make_row('a'), make_row('b')])
+    connection.commit()
+    connection.close()
+
+    store = PostStore(path)
+    connection = store.db_connection
+    assert connection.execute('SELECT COUNT(*) FROM posts').fetchone() == (2,)
+    assert connection.execute('PRAGMA user_version').fetchone() == (len(MIGRATIONS),)
+    indexes = {row[1] for row in connection.execute("PRAGMA index_list('posts')")}
+    assert {'posts_post_id', 'posts_word', 'posts_date'} <= indexes
+
+
+def test_new_post_ids_and_batched_inserts(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'), batch_size=2)
+    store.add_post(*make_row('a'))
+    assert store.visited('a')
+    assert store.new_post_ids(['c', 'a', 'b']) == ['c', 'b']
+    store.add_post(*make_row('b'))
+    assert store.pending == []
+    store.add_post(*make_row('c'))
+    store.close()
+
+    store = PostStore(str(tmp_path / 'posts.db'))
+    ids = [f'id{i}' for i in range(1200)] + ['b']
+    assert store.new_post_ids(ids) == ids[:-1]
+    assert not store.visited('d')
+
+
+def test_normalizes_legacy_posts_and_aggregates(tmp_path):
+    path = str(tmp_path / 'posts.db')
+    connection = sqlite3.connect(path)
+    connection.execute('''CREATE TABLE posts(
+        post_id, link, word, translation, raw_result, date, subreddit)''')
+    connection.executemany('INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?)',
+                           [make_row('a'), make_row('b')])
+    connection.commit()
+    connection.close()
+
+    store = PostStore(path)
+    store.add_post('c', '', 'Preis', 'price', '{}', '2018-02-04', 'German')
+    store.add_post('d', '', 'Dampf', 'steam', '{}', '2018-02-05', 'German')
+    store.flush()
+    store.add_failure('e', 'German', ValueError('oops'))
+
+    assert store.db_connection.execute(
+        'SELECT COUNT(*), COUNT(raw_result) FROM posts').fetchone() == (4, 0)
+    assert store.db_connection.execute(
+        'SELECT COUNT(*) FROM words').fetchone() == (2,)
+    stats = store.stats(top=1)
+    assert stats['top_words'] == [('Dampf', 3)]
+    assert stats['subreddits'] == [('German', 2, 1), ('Sprache', 2, 0)]
+    assert stats['failures'] == [('German', 'ValueError', 1)]
+
+
+def test_archive_keeps_posts_visited(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    store.add_post('a', 'https://redd.it/a', 'Dampf', 'steam', '{}',
+                   '2018-02-03 13:00:28', 'Sprache')
+    store.add_post('b', 'https://redd.it/b', 'Preis', 'price', '{}',
+                   '2019-02-03 13:00:28', 'Sprache')
+    assert store.archive('2019-01-01') == 1
+
+    assert store.new_post_ids(['a', 'b', 'c']) == ['c']
+    archived = list(store.archived_posts())
+    assert [(post['post_id'], post['link']) for post in archived] == [
+        ('a', 'https://redd.it/a')]
+    assert store.stats()['subreddits'] == [('Sprache', 2, 0)]
+    assert store.archive('2019-01-01') == 0
+
+
+def test_failures_are_counted_once_per_post(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    try:
+        raise SearchError('Server error')
+    except SearchError as e:
+        transient = DeutscherBotException('Error searching Preis')
+        transient.__cause__ = e
+    for _ in range(3):
+        store.add_failure('a', 'Sprache', transient)
+    store.add_failure('b', 'Sprache', TranslationException('Translation'))
+
+    assert store.stats()['failures'] == [('Sprache', 'SearchError', 1),
+                                         ('Sprache', 'TranslationException', 1)]
+    assert store.stats()['subreddits'] == [('Sprache', 0, 2)]
+    # Only the permanent failure is given up on.
+    assert store.new_post_ids(['a', 'b', 'c']) == ['a', 'c']
+
+
+def test_transient_failures_are_retried(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    for _ in range(5):
+        store.add_failure('a', 'Sprache', SearchError('Server error'))
+        assert store.new_post_ids(['a']) == ['a']
+
+
+def test_claimed_posts_are_not_new(tmp_path):
+    path = str(tmp_path / 'posts.db')
+    store = PostStore(path)
+    assert store.claim('a')
+    store.add_post('a', '', 'Dampf', '', '', '', 'Sprache')
+    # Crash before the pending post is flushed.
+    store = PostStore(path)
+    assert store.new_post_ids(['a', 'b']) == ['b']
@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from conftest import Post
+from exceptions import DeutscherBotException, NoResultsError, SearchError
+from storage import PostStore
+from watcher import Backoff, Watcher, fullname_to_int
+
+
+class Limiter(object):
+    def acquire(self):
+        pass
+
+
+class FakeBot(object):
+    subreddit_name = 'Sprache'
+
+    def __init__(self, store):
+        self.store = store
+        self.reply_limiter = Limiter()
+        self.replied = []
+        self.errors = {}
+
+    def visited_db(self, post):
+        return self.store.visited(post.id)
+
+    def lookup_post(self, post):
+        error = self.errors.get(post.id)
+        if error is not None:
+            raise error
+        return post.title
+
+    def reply_post(self, post, lookup_result):
+        if post.id == 'ratelimited':
+            raise RuntimeError('RATELIMIT: try again in 5 minutes')
+        self.replied.append(post.id)
+        self.store.add_post(post.id, post.url, '', '', '', '', self.subreddit_name)
+
+    def add_failure_to_db(self, post, exception):
+        self.store.add_failure(post.id, self.subreddit_name, exception)
+
+
+def test_backoff_grows_and_is_capped():
+    backoff = Backoff(base=1, cap=10, rand=lambda low, high: high)
+    assert [backoff.next_delay() for _ in range(5)] == [1, 2, 4, 8, 10]
+    backoff.reset()
+    assert backoff.next_delay() == 1
+
+
+def test_process_skips_posts_up_to_checkpoint(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    bot = FakeBot(store)
+    watcher = Watcher(bot, stop_event=threading.Event())
+    for post_id in ['7tm4s1', '7tm4s3']:
+        watcher.process(Post(post_id))
+    assert store.get_checkpoint('Sprache') == 't3_7tm4s3'
+
+    watcher.process(Post('7tm4s2'))
+    watcher.process(Post('7tm4s4'))
+    assert bot.replied == ['7tm4s1', '7tm4s3', '7tm4s4']
+    assert fullname_to_int('t3_7tm4s4') > fullname_to_int('t3_7tm4s3')
+
+
+def wrapped(error):
+    try:
+        raise error
+    except SearchError as e:
+        try:
+            raise DeutscherBotException('Error searching') from e
+        except DeutscherBotException as wrapper:
+            return wrapper
+
+
+def test_only_replies_and_permanent_failures_are_checkpointed(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    bot = FakeBot(store)
+    watcher = Watcher(bot, stop_event=threading.Event())
+    bot.errors = {'7tm4s1': wrapped(NoResultsError('No results')),
+                  '7tm4s2': wrapped(SearchError('Server error')),
+                  '7tm4s3': KeyError('word_type')}
+
+    watcher.process(Post('7tm4s1'))
+    assert store.get_checkpoint('Sprache') == 't3_7tm4s1'
+    for post_id in ['7tm4s2', '7tm4s3', 'ratelimited']:
+        with pytest.raises(Exception):
+            watcher.process(Post(post_id))
+    assert store.get_checkpoint('Sprache') == 't3_7tm4s1'
+
+    # Temporary failures are retried until the lookup works.
+    with pytest.raises(Exception):
+        watcher.process(Post('7tm4s2'))
+    del bot.errors['7tm4s2']
+    watcher.process(Post('7tm4s2'))
+    assert bot.replied == ['7tm4s2']
+    assert store.get_checkpoint('Sprache') == 't3_7tm4s2'
+
+
+def test_run_backs_off_on_errors(tmp_path):
+    store = PostStore(str(tmp_path / 'posts.db'))
+    bot = FakeBot(store)
+    stop_event = threading.Event()
+    delays = []
+
+    class Backoff(object):
+        def next_delay(self):
+            delays.append(1)
+            if len(delays) == 3:
+                stop_event.set()
+            return 0
+
+        def reset(self):
+            pass
+
+    watcher = Watcher(bot, backoff=Backoff(), stop_event=stop_event)
+    watcher._watch = lambda: watcher.process(Post('ratelimited'))
+    watcher.run()
+    assert len(delays) == 3
+    assert bot.replied == []
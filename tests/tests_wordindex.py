@@ -0,0 +1,58 @@
+from exceptions import DeutscherBotException, NoResultsError, SearchError
+from wordindex import WordIndex, build_index
+
+
+class FakeBot(object):
+    HEADWORDS = {'Hört': 'hören', 'hören': 'hören', 'Dampf': 'Dampf'}
+
+    def __init__(self):
+        self.searched = []
+        self.unavailable = {'Preis'}
+
+    def search_word(self, word):
+        self.searched.append(word)
+        if word == 'Xyz':
+            try:
+                raise NoResultsError('No results')
+            except SearchError as e:
+                raise DeutscherBotException(f"Error searching {word}") from e
+        if word in self.unavailable:
+            raise DeutscherBotException('Server error')
+        return {'word': self.HEADWORDS[word], 'translation': 'to hear'}
+
+    def prepare_comment(self, word_details):
+        return f"**{word_details['word']}**"
+
+
+def test_build_index_and_resume(tmp_path):
+    index = WordIndex(str(tmp_path / 'words.db'))
+    bot = FakeBot()
+    words = ['Hört', 'Hört ', 'Dampf', 'Xyz', 'Preis']
+    assert build_index(bot, words, index, workers=2) == (2, 2)
+    assert sorted(bot.searched) == ['Dampf', 'Hört', 'Preis', 'Xyz']
+    assert index.get('hören') == ({'word': 'hören', 'translation': 'to hear'},
+                                  '**hören**')
+    assert index.get(' Hört')[1] == '**hören**'
+    assert index.get('Haus') is None
+
+    # Only the word that failed temporarily is searched again.
+    bot.searched = []
+    bot.unavailable = set()
+    bot.HEADWORDS = dict(FakeBot.HEADWORDS, Preis='Preis')
+    assert build_index(bot, words, index) == (1, 0)
+    assert bot.searched == ['Preis']
+
+
+def test_build_index_records_unexpected_errors(tmp_path):
+    class Bot(FakeBot):
+        def prepare_comment(self, word_details):
+            if word_details['word'] == 'Dampf':
+                # Like a result without word_type.
+                raise AttributeError("'NoneType' object has no attribute 'title'")
+            return super().prepare_comment(word_details)
+
+    index = WordIndex(str(tmp_path / 'words.db'))
+    assert build_index(Bot(), ['Dampf', 'Hört'], index, workers=2) == (1, 1)
+    assert index.get('Hört') is not None
+    # Not permanent, it's searched again on the next build.
+    assert index.pending_words(['Dampf', 'Hört']) == ['Dampf']
@@ -0,0 +1,110 @@
+import random
+import signal
+import threading
+from datetime import datetime as d
+
+from exceptions import is_permanent
+from metrics import REGISTRY
+
+
+def fullname_to_int(fullname):
+    """Reddit ids are base 36 numbers that increase over time."""
+    return int(fullname.split('_')[-1], 36)
+
+
+class Backoff(object):
+    """Exponential backoff with full jitter."""
+
+    def __init__(self, base=1, cap=300, rand=random.uniform):
+        self.base = base
+        self.cap = cap
+        self.rand = rand
+        self.failures = 0
+
+    def next_delay(self):
+        delay = min(self.cap, self.base * 2 ** self.failures)
+        self.failures += 1
+        return self.rand(0, delay)
+
+    def reset(self):
+        self.failures = 0
+
+
+class Watcher(object):
+    """Replies to new posts of a subreddit as soon as they are submitted.
+
+    Uses the submission stream of praw, saving the fullname of the last post
+    processed so a restart doesn't process older posts again. A post is
+    only checkpointed once it was replied, its lookup failed for good or
+    it is already in the store; any other error restarts the stream after
+    a backoff, until `stop` is called. If a metrics_path is given, metrics
+    are written there after every post.
+    """
+    # Polls without new posts after which the stream yields None.
+    PAUSE_AFTER = 0
+
+    def __init__(self, bot, backoff=None, stop_event=None, metrics_path=None):
+        self.bot = bot
+        self.metrics_path = metrics_path
+        self.subreddit = bot.subreddit_name
+        self.backoff = backoff or Backoff()
+        self.stop_event = stop_event or threading.Event()
+
+    def stop(self, *args):
+        print("Stopping watcher...")
+        self.stop_event.set()
+
+    def install_signal_handlers(self):
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+
+    def run(self):
+        print(f"Watching /r/{self.subreddit}")
+        while not self.stop_event.is_set():
+            try:
+                self._watch()
+            except Exception as e:
+                # Reddit and Pons errors, RATELIMIT replies or unexpected
+                # results: wait and retry the post that failed.
+                REGISTRY.inc('errors', stage='watch', exception=type(e).__name__)
+                delay = self.backoff.next_delay()
+                print(f"Error watching /r/{self.subreddit}: {e!r}, "
+                      f"retrying in {delay:.1f} seconds...")
+                self.stop_event.wait(delay)
+        self.bot.store.flush()
+        print("My job has ended")
+
+    def _watch(self):
+        stream = self.bot.subreddit.stream.submissions(
+            pause_after=self.PAUSE_AFTER)
+        for post in stream:
+            if self.stop_event.is_set():
+                return
+            if post is None:
+                # No new posts, give the stop event a chance to be set.
+                self.stop_event.wait(1)
+                continue
+            self.process(post)
+
+    def process(self, post):
+        checkpoint = self.bot.store.get_checkpoint(self.subreddit)
+        if checkpoint and fullname_to_int(post.fullname) <= fullname_to_int(checkpoint):
+            return
+        if self.bot.visited_db(post):
+            print(f"Skipping '{post.title}', already visited")
+        else:
+            try:
+                lookup_result = self.bot.lookup_post(post)
+            except Exception as e:
+                print(f"Could not look up '{post.title}': {e!r}")
+                self.bot.add_failure_to_db(post, e)
+                if not is_permanent(e):
+                    raise
+            else:
+                self.bot.reply_limiter.acquire()
+                self.bot.reply_post(post, lookup_result)
+                self.bot.store.flush()
+        self.bot.store.set_checkpoint(self.subreddit, post.fullname, d.now())
+        self.backoff.reset()
+        if self.metrics_path:
+            REGISTRY.write(self.metrics_path)
@@ -0,0 +1,118 @@
+import sqlite3
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from cache import normalize_word
+from exceptions import is_permanent
+
+DB_PATH = os.path.join(os.path.dirname(__file__), 'db')
+
+
+
+class WordIndex(object):
+    """On disk index of precomputed lookups.
+
+    Entries are keyed by headword and hold the parsed result of the lookup
+    and the comment rendered from it. Every word that was searched is an
+    alias of the headword it resolved to, so 'Hört' finds the entry of
+    'hören'.
+    """
+
+    def __init__(self, path=os.path.join(DB_PATH, 'words.db')):
+        self.lock = threading.Lock()
+        self.db_connection = sqlite3.connect(path, check_same_thread=False)
+        with self.db_connection:
+            self.db_connection.execute('''CREATE TABLE IF NOT EXISTS entries(
+                headword TEXT PRIMARY KEY, details TEXT, comment TEXT)''')
+            self.db_connection.execute('''CREATE TABLE IF NOT EXISTS aliases(
+                word TEXT PRIMARY KEY, headword TEXT)''')
+            self.db_connection.execute('''CREATE TABLE IF NOT EXISTS failures(
+                word TEXT PRIMARY KEY, error TEXT, permanent INTEGER)''')
+
+    def get(self, word):
+        """Return (word_details, comment) for word or None if not indexed."""
+        with self.lock:
+            row = self.db_connection.execute(
+                '''SELECT details, comment FROM aliases
+                JOIN entries USING (headword) WHERE word = ?''',
+                (normalize_word(word),)).fetchone()
+        if row is None:
+            return None
+        details, comment = row
+        return json.loads(details), comment
+
+    def add(self, word, word_details, comment):
+        headword = word_details['word']
+        details = json.dumps(word_details, separators=(',', ':'),
+                             ensure_ascii=False)
+        with self.lock, self.db_connection:
+            self.db_connection.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?)',
+                (headword, details, comment))
+            self.db_connection.executemany(
+                'INSERT OR REPLACE INTO aliases VALUES (?, ?)',
+                [(normalize_word(word), headword),
+                 (normalize_word(headword), headword)])
+            self.db_connection.execute(
+                'DELETE FROM failures WHERE word = ?', (normalize_word(word),))
+
+    def add_failure(self, word, exception):
+        permanent = is_permanent(exception)
+        with self.lock, self.db_connection:
+            self.db_connection.execute(
+                'INSERT OR REPLACE INTO failures VALUES (?, ?, ?)',
+                (normalize_word(word), repr(exception), permanent))
+
+    def pending_words(self, words):
+        """Words that still have to be resolved, without duplicates.
+
+        Words already indexed or that failed for good are left out, so an
+        interrupted build continues where it stopped.
+        """
+        with self.lock:
+            done = {row[0] for row in self.db_connection.execute(
+                'SELECT word FROM aliases UNION '
+                'SELECT word FROM failures WHERE permanent')}
+        pending = {}
+        for word in words:
+            key = normalize_word(word)
+            if key and key not in done and key not in pending:
+                pending[key] = word.strip()
+        return list(pending.values())
+
+    def close(self):
+        self.db_connection.close()
+
+
+def build_index(bot, words, index, workers=8):
+    """Resolve words through bot and store them in index.
+
+    Returns a (resolved, failed) tuple with the counts of this run.
+    """
+    words = index.pending_words(words)
+    print(f"Words to search {len(words)}")
+    resolved = failed = 0
+
+    def resolve(word):
+        word_details = bot.search_word(word)
+        return word_details, bot.prepare_comment(word_details)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(resolve, word): word for word in words}
+        for future in as_completed(futures):
+            word = futures[future]
+            try:
+                word_details, comment = future.result()
+            except Exception as e:
+                # Unexpected results too, or they would end the whole build.
+                print(f"Exception for word {word}: {e!r}")
+                index.add_failure(word, e)
+                failed += 1
+            else:
+                index.add(word, word_details, comment)
+                resolved += 1
+
+    print(f"Resolved {resolved} words, {failed} failed")
+    return resolved, failed